@@ -1,14 +1,23 @@
 import streamlit as st
-import re
-import random
-import smtplib
-from email.mime.text import MIMEText
 import time
-import json
-import os
+
+from auth.codes import EXPIRED, LOCKED, VALID, get_code_store
+from auth.directory import get_user_directory
+from auth.mailer import FAILED, SENT, build_message, get_mail_queue
+from auth.passwords import PasswordServiceBusy, get_password_service, is_password_strong
+from auth.ratelimit import client_ip, get_rate_limiters
+from auth.store import get_user_store
+from auth.tokens import (SESSION_COOKIE, clear_session_cookie, get_token_secret,
+                         issue_token, verify_token)
+from ui.payload import meter_payload
+from ui.session import track_session
+from ui.theme import apply_theme
 
 # Set page configuration
 st.set_page_config(page_title="Login - OSCE App", page_icon="🩺", layout="centered")
+meter_payload("Main Page")
+track_session()
+apply_theme()
 
 # Hide sidebar on login page
 st.markdown(
@@ -22,32 +31,10 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# File path for storing user data (for development/testing)
-USER_DATA_FILE = "user_data.json"
-
-# Function to load user data from file
-def load_user_data():
-    try:
-        if os.path.exists(USER_DATA_FILE):
-            with open(USER_DATA_FILE, "r") as f:
-                return json.load(f)
-    except Exception as e:
-        st.error(f"Error loading user data: {e}")
-    return {}
-
-# Function to save user data to file
-def save_user_data(user_data):
-    try:
-        with open(USER_DATA_FILE, "w") as f:
-            json.dump(user_data, f)
-    except Exception as e:
-        st.error(f"Error saving user data: {e}")
-
-# 📬 Email-sending function using Gmail SMTP
+# 📬 Queue the verification email; delivery happens on a background worker
 def send_verification_email(to_email, code):
     try:
         sender_email = st.secrets["GMAIL_USER"]
-        sender_password = st.secrets["GMAIL_PASS"]
         subject = "Your OSCE Signup Code (Check Inbox)"
         body = f"""
         Hi there 👋,
@@ -62,57 +49,97 @@ def send_verification_email(to_email, code):
         The OSCE Team 🩺
         """
 
-        msg = MIMEText(body, "plain")
-        msg["Subject"] = subject
-        msg["From"] = sender_email
-        msg["To"] = to_email
-
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
-        return True
+        msg = build_message(sender_email, to_email, subject, body)
+        return get_mail_queue().submit(msg)
     except Exception as e:
         print("SMTP Error:", e)
-        return False
+        return None
 
-# Password strength checker
-def is_password_strong(pw):
-    return bool(re.match(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).{8,}$", pw))
+# Show the delivery status of the verification email, polling until it settles
+def show_email_status(job_id):
+    status = get_mail_queue().status(job_id)
+    if status == SENT:
+        st.success("📬 A verification code has been sent to your email!")
+    elif status == FAILED:
+        st.error("❌ Failed to send email. Please try again.")
+    else:
+        st.info("📨 Sending your verification code...")
 
-# Initialize registered users
-if "registered_users" not in st.session_state:
-    # Load existing users from file
-    loaded_users = load_user_data()
-    
-    # Add test account if there are no users yet
-    if not loaded_users:
-        loaded_users = {
-            "test@example.com": {
-                "password": "Test1234",
-                "username": "testuser",
-                "created_at": "2023-01-01"
-            }
-        }
-        save_user_data(loaded_users)
-    
-    st.session_state.registered_users = loaded_users
+@st.fragment(run_every=1)
+def poll_email_status(job_id):
+    show_email_status(job_id)
+    if get_mail_queue().status(job_id) in (SENT, FAILED):
+        # Delivery finished, rerun the page once to stop polling
+        st.rerun()
 
 # Check if user is already logged in
 if st.session_state.get("logged_in", False):
     # Navigate to dashboard directly
     st.switch_page("pages/1_Dashboard.py")
 
+# Remove the remember-me cookie after logging out
+if st.session_state.pop("clear_session_cookie", False):
+    clear_session_cookie()
+else:
+    # Returning students with a valid remember-me cookie skip the login form.
+    # The signature check needs no store access; revocation is only checked
+    # once the token is about to be used.
+    claims = verify_token(get_token_secret(), st.context.cookies.get(SESSION_COOKIE))
+    if claims and not get_user_store().is_token_revoked(claims["jti"]):
+        st.session_state.logged_in = True
+        st.session_state.username = claims["name"]
+        st.session_state.session_claims = claims
+        st.session_state.shown_welcome = True
+        st.switch_page("pages/1_Dashboard.py")
+
+# Issue a remember-me token; the dashboard stores it in a cookie
+def remember_login(email, username):
+    token = issue_token(get_token_secret(), email, username)
+    st.session_state.session_claims = verify_token(get_token_secret(), token)
+    st.session_state.remember_token = token
+
+# Shared user directory (one copy per process, not per session)
+users = get_user_directory()
+
+# Password hashing runs on a bounded worker pool
+passwords = get_password_service()
+BUSY_MESSAGE = "⏳ The server is busy right now. Please try again in a moment."
+
+# Pending signup codes live server-side so they survive a page refresh
+codes = get_code_store()
+
+# Per-IP and per-email limits on form submissions
+limiters = get_rate_limiters()
+
+def rate_limited(form, email):
+    """Take a token for this form; show a retry message and return True if over the limit."""
+    retry_after = limiters[form].hit([("ip", client_ip()), ("email", email.strip().lower())])
+    if retry_after:
+        st.error(f"⏳ Too many attempts. Please try again in {retry_after} seconds.")
+    return bool(retry_after)
+
+# Add test account if there are no users yet
+if len(users) == 0:
+    users.add("test@example.com", {
+        "password": "Test1234",
+        "username": "testuser",
+        "created_at": "2023-01-01"
+    })
+
 # ✅ Handle ?nav=signup or ?nav=login in URL
 query_params = st.query_params
 if query_params.get("nav") == "signup":
     st.session_state.auth_mode = "Sign Up"
 elif query_params.get("nav") == "login":
     st.session_state.auth_mode = "Sign In"
+elif query_params.get("nav") == "verify":
+    st.session_state.auth_mode = "Sign Up"
+    st.session_state.show_verification = True
 
 if "auth_mode" not in st.session_state:
     st.session_state.auth_mode = "Sign In"
 
-st.markdown("<h1 style='text-align:center; color:#19527c;'>OSCE Practice App 🩺</h1>", unsafe_allow_html=True)
+st.markdown("<h1 class='osce-app-title'>OSCE Practice App 🩺</h1>", unsafe_allow_html=True)
 
 # Sign Up Form
 if st.session_state.auth_mode == "Sign Up":
@@ -125,56 +152,87 @@ if st.session_state.auth_mode == "Sign Up":
         submit_button = st.form_submit_button("Sign Up")
 
         if submit_button:
-            if not new_email or not new_password or not confirm_password:
+            if rate_limited("signup", new_email):
+                pass
+            elif not new_email or not new_password or not confirm_password:
                 st.warning("Please complete all fields.")
             elif new_password != confirm_password:
                 st.error("❌ Passwords do not match")
             elif not is_password_strong(new_password):
                 st.warning("⚠️ Password must be at least 8 characters and include uppercase, lowercase, and a number.")
-            elif new_email in st.session_state.registered_users:
+            elif new_email in users:
                 st.error(f"❌ The email '{new_email}' is already registered. Please use a different email or log in instead.")
+            elif codes.retry_after(new_email):
+                st.warning(f"⏳ A code was sent to this email recently. Please wait {codes.retry_after(new_email)} seconds before requesting another.")
             else:
-                # Generate verification code
-                code = str(random.randint(100000, 999999))
-                st.session_state.generated_code = code
-                st.session_state.current_signup_email = new_email
-                st.session_state.current_signup_password = new_password
-                
-                # Send verification email
-                if send_verification_email(new_email, code):
-                    st.success("📬 A verification code has been sent to your email!")
-                    st.session_state.show_verification = True
-                else:
-                    st.error("❌ Failed to send email. Please try again.")
+                # Hash the password now so the plaintext never sits in session state
+                try:
+                    password_hash = passwords.hash(new_password)
+                except PasswordServiceBusy:
+                    password_hash = None
+                    st.warning(BUSY_MESSAGE)
+
+                if password_hash:
+                    # Generate verification code, keeping the pending account with it
+                    code, retry_after = codes.issue(new_email, {"password": password_hash})
+                    if code is None:
+                        st.warning(f"⏳ Please wait {retry_after} seconds before requesting another code.")
+                    else:
+                        st.session_state.current_signup_email = new_email
+
+                        # Queue verification email
+                        job_id = send_verification_email(new_email, code)
+                        if job_id is not None:
+                            st.session_state.email_job = job_id
+                            st.session_state.show_verification = True
+                            st.query_params["nav"] = "verify"
+                        else:
+                            codes.discard(new_email)
+                            st.error("❌ Failed to send email. Please try again.")
+
+    # Delivery status of the last verification email
+    if st.session_state.get("email_job") is not None:
+        job_id = st.session_state.email_job
+        if get_mail_queue().status(job_id) in (SENT, FAILED):
+            show_email_status(job_id)
+        else:
+            poll_email_status(job_id)
 
     # Verification form
     if st.session_state.get("show_verification"):
         with st.form(key="verification_form"):
+            verify_email = st.text_input("Email address", value=st.session_state.get("current_signup_email", ""))
             user_code = st.text_input("Enter the verification code")
             verify_button = st.form_submit_button("Verify")
             
-            if verify_button:
-                if user_code == st.session_state.get("generated_code"):
-                    email = st.session_state.get("current_signup_email")
-                    password = st.session_state.get("current_signup_password")
+            if verify_button and not rate_limited("verify", verify_email):
+                result, pending = codes.verify(verify_email, user_code)
+                if result == VALID:
+                    email = verify_email
+                    password = pending["password"]
                     if email and password:
-                        # Store new user
-                        st.session_state.registered_users[email] = {
+                        # Store new user and publish it to all sessions
+                        created = users.add(email, {
                             "password": password,
                             "created_at": time.strftime("%Y-%m-%d"),
                             "username": email.split("@")[0]
-                        }
-                        
-                        # Save to file for persistence
-                        save_user_data(st.session_state.registered_users)
+                        })
+                        if not created:
+                            st.error(f"❌ The email '{email}' is already registered. Please log in instead.")
+                            st.stop()
                         
                         # Set session state
                         st.session_state.username = email.split("@")[0]
                         st.session_state.logged_in = True
                         st.session_state.shown_welcome = False
+                        remember_login(email, st.session_state.username)
                         
                         st.success("✅ Email verified and account created!")
                         st.switch_page("pages/1_Dashboard.py")
+                elif result == EXPIRED:
+                    st.error("❌ This code has expired. Please sign up again to get a new one.")
+                elif result == LOCKED:
+                    st.error("❌ Too many incorrect attempts. Please sign up again to get a new code.")
                 else:
                     st.error("❌ Invalid verification code")
 
@@ -190,39 +248,36 @@ elif st.session_state.auth_mode == "Sign In":
         submit_button = st.form_submit_button("Login")
 
         if submit_button:
-            if not login_email or not login_password:
+            if rate_limited("login", login_email):
+                pass
+            elif not login_email or not login_password:
                 st.warning("Please enter both email and password.")
             else:
-                # Check if the email exists in our registered users
-                if login_email in st.session_state.registered_users:
-                    user_data = st.session_state.registered_users[login_email]
-                    # Verify the password matches
-                    if login_password == user_data.get("password"):
+                # Look the email up in the shared directory; unknown emails are
+                # answered from memory unless the store has changed
+                user_data = users.lookup(login_email)
+                if user_data is not None:
+                    # Verify the password against the stored hash
+                    try:
+                        matches, new_hash = passwords.verify(login_password, user_data.get("password", ""))
+                    except PasswordServiceBusy:
+                        matches, new_hash = None, None
+                        st.warning(BUSY_MESSAGE)
+
+                    if matches:
+                        # Upgrade plaintext or outdated hashes on successful login
+                        if new_hash:
+                            users.update_password(login_email, new_hash)
                         st.session_state.logged_in = True
                         st.session_state.shown_welcome = False
                         st.session_state.username = user_data.get("username", login_email.split("@")[0])
+                        remember_login(login_email, st.session_state.username)
                         st.success("✅ Login successful!")
                         st.switch_page("pages/1_Dashboard.py")
-                    else:
+                    elif matches is not None:
                         st.error("❌ Incorrect password")
                 else:
-                    # Reload user data from disk in case it was updated
-                    loaded_users = load_user_data()
-                    st.session_state.registered_users = loaded_users
-                    
-                    # Check again after reload
-                    if login_email in st.session_state.registered_users:
-                        user_data = st.session_state.registered_users[login_email]
-                        if login_password == user_data.get("password"):
-                            st.session_state.logged_in = True
-                            st.session_state.shown_welcome = False
-                            st.session_state.username = user_data.get("username", login_email.split("@")[0])
-                            st.success("✅ Login successful!")
-                            st.switch_page("pages/1_Dashboard.py")
-                        else:
-                            st.error("❌ Incorrect password")
-                    else:
-                        st.error(f"❌ Email '{login_email}' is not registered. Please sign up first.")
+                    st.error(f"❌ Email '{login_email}' is not registered. Please sign up first.")
 
     st.markdown("Don't have an account? [Sign up here](?nav=signup)", unsafe_allow_html=True)
 
@@ -239,44 +294,18 @@ with col2:
 # Demo credentials note
 st.markdown("---")
 st.markdown("""
-    <div style="text-align: center; color: #666;">
+    <div class="osce-footer">
     <small>OSCE Practice App for Physiotherapy Students</small>
     </div>
     """, unsafe_allow_html=True)
 
-# Force reload registered users
-if st.button("🔄 Refresh Login System", help="Click this if you're having login issues"):
-    # Reload user data from disk
-    loaded_users = load_user_data()
-    st.session_state.registered_users = loaded_users
-    st.success("Login system refreshed!")
-    st.experimental_rerun()
-
 # Welcome Pop-up After Login
 if not st.session_state.get("shown_welcome", False) and st.session_state.get("logged_in", False):
     st.markdown(
         """
-        <style>
-        .fade-popup {
-            position: fixed;
-            top: 25%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            background-color: #ffffff;
-            padding: 2em 3em;
-            border-radius: 12px;
-            box-shadow: 0 0 20px rgba(0,0,0,0.2);
-            animation: fadeIn 1s ease-in-out forwards;
-            z-index: 9999;
-        }
-        @keyframes fadeIn {
-            from {opacity: 0; transform: translate(-50%, -60%);}
-            to {opacity: 1; transform: translate(-50%, -50%);}
-        }
-        </style>
-        <div class='fade-popup'>
-            <h3 style='color:#19527c;'>✅ Welcome!</h3>
-            <p style='font-size: 16px;'>You've successfully signed in to your OSCE Dashboard.</p>
+        <div class='osce-welcome-popup'>
+            <h3>✅ Welcome!</h3>
+            <p>You've successfully signed in to your OSCE Dashboard.</p>
         </div>
         """,
         unsafe_allow_html=True
@@ -0,0 +1,2 @@
+# Makes the auth module a package
+# Account storage and sign-in helpers used by Main Page.py
@@ -0,0 +1,116 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+# Results of VerificationCodeStore.verify()
+VALID = "valid"
+INVALID = "invalid"
+EXPIRED = "expired"
+LOCKED = "locked"
+MISSING = "missing"
+
+
+def _normalize(email):
+    return (email or "").strip().lower()
+
+
+class VerificationCodeStore:
+    """Process-wide signup codes with expiry, attempt limits and resend cooldowns.
+
+    Entries are kept in issue order, so with a single TTL the oldest entry
+    is always the next to expire. Expired entries are dropped from the front
+    and, once max_entries is reached, the least recently issued code is
+    evicted, which keeps memory bounded during signup bursts. Emails are
+    matched case-insensitively, so one address shares a single cooldown and
+    attempt counter however it is typed.
+    """
+
+    def __init__(self, ttl=600, max_entries=10000, max_attempts=5, resend_cooldown=60):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_attempts = max_attempts
+        self.resend_cooldown = resend_cooldown
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _purge_expired(self, now):
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry["expires_at"] > now:
+                break
+            self._entries.popitem(last=False)
+
+    def retry_after(self, email):
+        """Seconds until a new code may be sent to this email (0 if allowed now)."""
+        email = _normalize(email)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return 0
+            return max(0, int(entry["issued_at"] + self.resend_cooldown - now + 0.999))
+
+    def issue(self, email, payload=None):
+        """Create a code for an email.
+
+        Returns (code, 0), or (None, retry_after) while the resend cooldown
+        for this email is still running.
+        """
+        email = _normalize(email)
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._entries.get(email)
+            if entry is not None and now - entry["issued_at"] < self.resend_cooldown:
+                return None, max(1, int(entry["issued_at"] + self.resend_cooldown - now + 0.999))
+
+            code = f"{secrets.randbelow(900000) + 100000}"
+            self._entries[email] = {
+                "code": code,
+                "payload": payload,
+                "issued_at": now,
+                "expires_at": now + self.ttl,
+                "attempts": 0,
+            }
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return code, 0
+
+    def verify(self, email, code):
+        """Check a submitted code. Returns (result, payload); payload is only set when VALID."""
+        email = _normalize(email)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return MISSING, None
+            if entry["expires_at"] <= now:
+                del self._entries[email]
+                return EXPIRED, None
+            if entry["attempts"] >= self.max_attempts:
+                return LOCKED, None
+            if not secrets.compare_digest(entry["code"], code.strip()):
+                entry["attempts"] += 1
+                if entry["attempts"] >= self.max_attempts:
+                    return LOCKED, None
+                return INVALID, None
+            del self._entries[email]
+            return VALID, entry["payload"]
+
+    def discard(self, email):
+        email = _normalize(email)
+        with self._lock:
+            self._entries.pop(email, None)
+
+
+@st.cache_resource
+def get_code_store():
+    """Return the verification code store shared by every session."""
+    return VerificationCodeStore()
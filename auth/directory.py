@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+import streamlit as st
+
+from auth.store import USER_DB_FILE, get_user_store
+
+# Immutable view of every account at one store version
+Snapshot = namedtuple("Snapshot", ["version", "users"])
+
+# Seconds between checks of the store's change counter on unknown emails.
+# Signups made through this process are visible immediately; writes from
+# other processes show up within this interval.
+VERSION_CHECK_INTERVAL = 2.0
+
+
+class UserDirectory:
+    """Process-wide, read-mostly view of registered accounts shared by all sessions.
+
+    Readers use the current snapshot without locking. Writers build a new
+    snapshot and swap it in, so a session never sees a half-updated dict.
+    """
+
+    def __init__(self, store, check_interval=VERSION_CHECK_INTERVAL):
+        self.store = store
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = self._load()
+        self._checked_at = time.monotonic()
+        self.negative_hits = 0
+
+    def _load(self):
+        version = self.store.version()
+        users = dict(self.store.items())
+        return Snapshot(version, MappingProxyType(users))
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def get(self, email):
+        return self._snapshot.users.get(email)
+
+    def __contains__(self, email):
+        return email in self._snapshot.users
+
+    def __len__(self):
+        return len(self._snapshot.users)
+
+    def lookup(self, email):
+        """Find an account for sign-in, answering unknown emails from memory.
+
+        The snapshot is the exact set of known emails at its store version,
+        so a miss only goes to the store when the last version check is
+        older than check_interval, and only reloads if the version moved.
+        """
+        record = self._snapshot.users.get(email)
+        if record is not None:
+            return record
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            self.negative_hits += 1
+            return None
+        self._checked_at = now
+        if self.refresh_if_changed():
+            return self._snapshot.users.get(email)
+        return None
+
+    def add(self, email, record):
+        """Register a new account and publish it to every session."""
+        with self._lock:
+            if not self.store.add(email, record):
+                return False
+            current = self._snapshot
+            version = self.store.version()
+            if version != current.version + 1:
+                # Another process wrote to the store as well, so reload it all
+                self._snapshot = self._load()
+            else:
+                users = dict(current.users)
+                users[email] = dict(record)
+                self._snapshot = Snapshot(version, MappingProxyType(users))
+        return True
+
+    def update_password(self, email, password):
+        """Store a new password hash and publish the updated record."""
+        with self._lock:
+            if not self.store.update_password(email, password):
+                return False
+            current = self._snapshot
+            version = self.store.version()
+            if version != current.version + 1 or email not in current.users:
+                self._snapshot = self._load()
+            else:
+                users = dict(current.users)
+                users[email] = dict(users[email], password=password)
+                self._snapshot = Snapshot(version, MappingProxyType(users))
+        return True
+
+    def refresh_if_changed(self):
+        """Reload the snapshot if the store was changed outside this directory."""
+        if self.store.version() == self._snapshot.version:
+            return False
+        with self._lock:
+            if self.store.version() != self._snapshot.version:
+                self._snapshot = self._load()
+        return True
+
+
+@st.cache_resource
+def get_user_directory(path=USER_DB_FILE):
+    """Return the user directory shared by every session in this process."""
+    return UserDirectory(get_user_store(path))
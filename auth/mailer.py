@@ -0,0 +1,202 @@
+import itertools
+import logging
+import queue
+import smtplib
+import threading
+import time
+from collections import OrderedDict
+from email.mime.text import MIMEText
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Delivery states reported by MailQueue.status()
+QUEUED = "queued"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def build_message(sender, to_email, subject, body):
+    msg = MIMEText(body, "plain")
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = to_email
+    return msg
+
+
+class SMTPTransport:
+    """Sends mail over one SMTP connection that is kept open between messages."""
+
+    def __init__(self, host, port, username=None, password=None, use_ssl=True, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._server = None
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self._server = server
+
+    def send(self, msg):
+        if self._server is None:
+            self._connect()
+        try:
+            self._server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # The server dropped our idle connection, reconnect once
+            self.close()
+            self._connect()
+            self._server.send_message(msg)
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+
+class SendGridTransport:
+    """Sends mail through the SendGrid web API (needs the sendgrid package)."""
+
+    def __init__(self, api_key):
+        from sendgrid import SendGridAPIClient
+
+        self._client = SendGridAPIClient(api_key)
+
+    def send(self, msg):
+        from sendgrid.helpers.mail import Mail
+
+        mail = Mail(
+            from_email=msg["From"],
+            to_emails=msg["To"],
+            subject=msg["Subject"],
+            plain_text_content=msg.get_payload(decode=True).decode(msg.get_content_charset() or "utf-8"),
+        )
+        response = self._client.send(mail)
+        if response.status_code >= 300:
+            raise RuntimeError(f"SendGrid returned {response.status_code}: {response.body}")
+
+    def close(self):
+        pass
+
+
+class MailQueue:
+    """Bounded outgoing mail queue served by a small pool of worker threads.
+
+    Each worker owns one transport, so connections are reused across
+    messages instead of reopened for every email.
+    """
+
+    def __init__(self, transport_factory, workers=2, maxsize=500, max_attempts=3,
+                 backoff=1.0, idle_timeout=60, status_limit=10000):
+        self.transport_factory = transport_factory
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.status_limit = status_limit
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._status = OrderedDict()
+        self._status_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._stopped = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"mail-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, msg):
+        """Queue a message. Returns a job id, or None if the queue is full."""
+        job_id = next(self._ids)
+        self._set_status(job_id, QUEUED)
+        try:
+            self._queue.put_nowait((job_id, msg))
+        except queue.Full:
+            self._set_status(job_id, FAILED)
+            return None
+        return job_id
+
+    def status(self, job_id):
+        with self._status_lock:
+            return self._status.get(job_id)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def join(self):
+        """Block until every queued message has been sent or has failed."""
+        self._queue.join()
+
+    def _set_status(self, job_id, status):
+        with self._status_lock:
+            self._status[job_id] = status
+            self._status.move_to_end(job_id)
+            # Forget the oldest jobs so the status table stays bounded
+            while len(self._status) > self.status_limit:
+                self._status.popitem(last=False)
+
+    def _work(self):
+        transport = self.transport_factory()
+        while not self._stopped.is_set():
+            try:
+                job_id, msg = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # Nothing to send for a while, don't hold the connection open
+                transport.close()
+                continue
+            if job_id is None:
+                break
+            self._set_status(job_id, SENDING)
+            for attempt in range(self.max_attempts):
+                try:
+                    transport.send(msg)
+                    self._set_status(job_id, SENT)
+                    break
+                except Exception:
+                    logger.warning("Mail job %s: attempt %d of %d failed", job_id, attempt + 1,
+                                   self.max_attempts, exc_info=True)
+                    transport.close()
+                    if attempt + 1 < self.max_attempts:
+                        time.sleep(self.backoff * (2 ** attempt))
+            else:
+                self._set_status(job_id, FAILED)
+            self._queue.task_done()
+        transport.close()
+
+    def shutdown(self):
+        self._stopped.set()
+        for _ in self._workers:
+            self._queue.put((None, None))
+        for worker in self._workers:
+            worker.join()
+
+
+@st.cache_resource
+def get_mail_queue():
+    """Return the process-wide mail queue configured from st.secrets.
+
+    SMTP_HOST, SMTP_PORT and SMTP_SSL can point it at a local test server.
+    """
+    host = st.secrets.get("SMTP_HOST", "smtp.gmail.com")
+    port = int(st.secrets.get("SMTP_PORT", 465))
+    use_ssl = str(st.secrets.get("SMTP_SSL", "true")).lower() != "false"
+    username = st.secrets.get("GMAIL_USER")
+    password = st.secrets.get("GMAIL_PASS")
+
+    def transport_factory():
+        return SMTPTransport(host, port, username, password, use_ssl=use_ssl)
+
+    return MailQueue(transport_factory)
@@ -0,0 +1,155 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+# scrypt work factor (N). Raise it as hardware gets faster; older hashes
+# are upgraded on the next successful login.
+DEFAULT_COST = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+HASH_PREFIX = "scrypt$"
+
+
+# Password strength checker
+def is_password_strong(pw):
+    return bool(re.match(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).{8,}$", pw))
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, cost=DEFAULT_COST):
+    """Hash a password with scrypt and a random salt."""
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=cost, r=SCRYPT_R, p=SCRYPT_P,
+        maxmem=256 * cost * SCRYPT_R, dklen=32,
+    )
+    return f"{HASH_PREFIX}{cost}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password(password, stored, cost=DEFAULT_COST):
+    """Check a password against a stored value.
+
+    Returns (matches, needs_rehash). Accounts created before hashing was
+    introduced still hold the plaintext password; those always need a rehash.
+    """
+    if not stored.startswith(HASH_PREFIX):
+        matches = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        return matches, matches
+
+    n, r, p, salt, expected = stored[len(HASH_PREFIX):].split("$")
+    n, r, p = int(n), int(r), int(p)
+    digest = hashlib.scrypt(
+        password.encode("utf-8"), salt=base64.b64decode(salt), n=n, r=r, p=p,
+        maxmem=256 * n * r, dklen=32,
+    )
+    matches = hmac.compare_digest(digest, base64.b64decode(expected))
+    return matches, matches and (n, r, p) != (cost, SCRYPT_R, SCRYPT_P)
+
+
+class PasswordServiceBusy(Exception):
+    """Raised when too many hash jobs are already waiting."""
+
+
+class PasswordService:
+    """Runs password hashing on a bounded thread pool and records its load.
+
+    At most max_pending jobs are queued or running at once; beyond that new
+    requests fail fast with PasswordServiceBusy instead of piling up behind
+    a login storm and stalling page reruns.
+    """
+
+    def __init__(self, workers=2, max_pending=32, cost=DEFAULT_COST, sample_size=1000):
+        self.cost = cost
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_times = deque(maxlen=sample_size)
+        self._run_times = deque(maxlen=sample_size)
+
+    def _run(self, enqueued_at, fn, args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._wait_times.append(started - enqueued_at)
+                self._run_times.append(finished - started)
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordServiceBusy()
+            self._pending += 1
+        return self._executor.submit(self._run, time.perf_counter(), fn, args)
+
+    def hash(self, password, timeout=None):
+        """Hash a new password. Blocks until a worker has done it."""
+        return self._submit(hash_password, password, self.cost).result(timeout)
+
+    def verify(self, password, stored, timeout=None):
+        """Check a login attempt.
+
+        Returns (matches, new_hash). new_hash is set when the stored value
+        was plaintext or used an old cost and should be replaced.
+        """
+        return self._submit(self._verify, password, stored).result(timeout)
+
+    def _verify(self, password, stored):
+        matches, needs_rehash = verify_password(password, stored, self.cost)
+        if needs_rehash:
+            return matches, hash_password(password, self.cost)
+        return matches, None
+
+    def stats(self):
+        """Queue depth and latency figures for monitoring."""
+        with self._lock:
+            wait_times = sorted(self._wait_times)
+            run_times = sorted(self._run_times)
+            stats = {
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+        def ms(values, fraction):
+            if not values:
+                return 0.0
+            return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+        stats["wait_p50_ms"] = ms(wait_times, 0.5)
+        stats["wait_p95_ms"] = ms(wait_times, 0.95)
+        stats["run_p50_ms"] = ms(run_times, 0.5)
+        stats["run_p95_ms"] = ms(run_times, 0.95)
+        return stats
+
+
+@st.cache_resource
+def get_password_service():
+    """Return the process-wide password service.
+
+    PASSWORD_COST, PASSWORD_WORKERS and PASSWORD_MAX_PENDING can be set in
+    the environment to tune it for the host.
+    """
+    return PasswordService(
+        workers=int(os.environ.get("PASSWORD_WORKERS", 2)),
+        max_pending=int(os.environ.get("PASSWORD_MAX_PENDING", 32)),
+        cost=int(os.environ.get("PASSWORD_COST", DEFAULT_COST)),
+    )
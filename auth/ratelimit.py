@@ -0,0 +1,87 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+# Number of reverse proxies in front of the app that append to
+# X-Forwarded-For. 0 means the header is client-controlled and ignored.
+TRUSTED_PROXY_HOPS = int(os.environ.get("OSCE_TRUSTED_PROXY_HOPS", 0))
+
+
+class RateLimiter:
+    """Token buckets keyed by client (IP address, email, ...).
+
+    Buckets are kept in least-recently-used order, so idle ones sit at the
+    front and are dropped in O(1) each as the limiter is used. A bucket idle
+    for longer than it takes to refill is the same as a fresh one, so
+    forgetting it changes nothing.
+    """
+
+    def __init__(self, capacity, per_seconds, max_keys=100000):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.idle_ttl = per_seconds
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _prune(self, now):
+        while self._buckets:
+            updated_at = next(iter(self._buckets.values()))[1]
+            if now - updated_at < self.idle_ttl and len(self._buckets) <= self.max_keys:
+                break
+            self._buckets.popitem(last=False)
+
+    def hit(self, keys, cost=1):
+        """Take a token from every bucket in keys.
+
+        Returns 0 if allowed, otherwise the whole number of seconds to wait.
+        Nothing is taken unless every bucket has enough tokens.
+        """
+        keys = [key for key in keys if key[-1]]
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            buckets = []
+            wait = 0.0
+            for key in keys:
+                tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+                tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+                if tokens < cost:
+                    wait = max(wait, (cost - tokens) / self.rate)
+                buckets.append((key, tokens))
+            for key, tokens in buckets:
+                if not wait:
+                    tokens -= cost
+                self._buckets[key] = (tokens, now)
+        return math.ceil(wait)
+
+
+def client_ip():
+    """Best guess at the address of the browser running this session."""
+    ip = getattr(st.context, "ip_address", None)
+    forwarded = st.context.headers.get("X-Forwarded-For") if TRUSTED_PROXY_HOPS else None
+    if forwarded:
+        # Each trusted proxy appends the address it saw, so the client is the
+        # entry that many hops from the right; anything further left is
+        # whatever the browser sent
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            ip = hops[-TRUSTED_PROXY_HOPS]
+    return ip
+
+
+@st.cache_resource
+def get_rate_limiters():
+    """Process-wide limiters for the login, signup and verification forms."""
+    return {
+        "login": RateLimiter(capacity=10, per_seconds=60),
+        "signup": RateLimiter(capacity=5, per_seconds=600),
+        "verify": RateLimiter(capacity=10, per_seconds=300),
+    }
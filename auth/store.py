@@ -0,0 +1,269 @@
+import json
+import os
+import sqlite3
+import threading
+
+import streamlit as st
+
+# SQLite database holding registered accounts
+USER_DB_FILE = os.environ.get("OSCE_USER_DB", "users.db")
+
+# Legacy JSON file, migrated into the database on first start
+USER_DATA_FILE = "user_data.json"
+
+# Rows written per transaction while migrating
+MIGRATION_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    username TEXT NOT NULL,
+    created_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti TEXT PRIMARY KEY,
+    expires_at INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+CREATE TRIGGER IF NOT EXISTS users_version_insert AFTER INSERT ON users BEGIN
+    UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS users_version_update AFTER UPDATE ON users BEGIN
+    UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS users_version_delete AFTER DELETE ON users BEGIN
+    UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+END;
+"""
+
+
+def iter_json_users(path, chunk_size=65536):
+    """Yield (email, record) pairs from a JSON user file without loading it all at once."""
+    decoder = json.JSONDecoder()
+    with open(path, "r") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            # Drop consumed text and read the next chunk
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                fill()
+
+        def expect(char):
+            nonlocal pos
+            skip_whitespace()
+            if pos >= len(buffer) or buffer[pos] != char:
+                raise ValueError(f"Expected '{char}' at offset {pos} in {path}")
+            pos += 1
+
+        def decode_value():
+            nonlocal pos
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # A number at the end of the buffer may continue in the next chunk
+                    if end < len(buffer) or eof:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        fill()
+        skip_whitespace()
+        if pos >= len(buffer):
+            return
+        expect("{")
+        skip_whitespace()
+        if pos < len(buffer) and buffer[pos] == "}":
+            return
+        while True:
+            email = decode_value()
+            expect(":")
+            record = decode_value()
+            yield email, record
+            skip_whitespace()
+            if pos < len(buffer) and buffer[pos] == ",":
+                pos += 1
+                continue
+            expect("}")
+            return
+
+
+class UserStore:
+    """Indexed account storage backed by SQLite in WAL mode."""
+
+    def __init__(self, path=USER_DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # sqlite3 connections can't be shared between threads, so each
+        # Streamlit script thread gets its own
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get(self, email):
+        """Return the account record for an email, or None if it isn't registered."""
+        row = self._connect().execute(
+            "SELECT password, username, created_at FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(row)
+
+    def __contains__(self, email):
+        row = self._connect().execute(
+            "SELECT 1 FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return row is not None
+
+    def version(self):
+        """Change counter bumped by every write to the users table, from any process."""
+        return int(self.get_meta("version", 0))
+
+    def existing(self, emails):
+        """Return the subset of emails that are already registered."""
+        emails = list(emails)
+        found = set()
+        conn = self._connect()
+        # Stay under SQLite's limit on bound parameters
+        for start in range(0, len(emails), 500):
+            chunk = emails[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT email FROM users WHERE email IN ({placeholders})", chunk)
+            found.update(row["email"] for row in rows)
+        return found
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def add(self, email, record):
+        """Insert one account. Returns False if the email is already registered."""
+        try:
+            self._connect().execute(
+                "INSERT INTO users (email, password, username, created_at) VALUES (?, ?, ?, ?)",
+                (email, record["password"], record["username"], record["created_at"]),
+            )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def update_password(self, email, password):
+        """Replace the stored password (hash) for an existing account."""
+        cursor = self._connect().execute(
+            "UPDATE users SET password = ? WHERE email = ?", (password, email)
+        )
+        return cursor.rowcount > 0
+
+    def add_many(self, items):
+        """Insert (email, record) pairs in one transaction, skipping existing emails."""
+        conn = self._connect()
+        rows = [
+            (email, record["password"], record.get("username", email.split("@")[0]),
+             record.get("created_at", ""))
+            for email, record in items
+        ]
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO users (email, password, username, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return cursor.rowcount
+
+    def items(self):
+        """Yield every (email, record) pair."""
+        cursor = self._connect().execute(
+            "SELECT email, password, username, created_at FROM users"
+        )
+        for row in cursor:
+            yield row["email"], {
+                "password": row["password"],
+                "username": row["username"],
+                "created_at": row["created_at"],
+            }
+
+    def revoke_token(self, jti, expires_at):
+        """Add a remember-me token to the revocation list and drop expired entries."""
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR IGNORE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)",
+            (jti, int(expires_at)),
+        )
+        conn.execute("DELETE FROM revoked_tokens WHERE expires_at < strftime('%s', 'now')")
+
+    def is_token_revoked(self, jti):
+        row = self._connect().execute(
+            "SELECT 1 FROM revoked_tokens WHERE jti = ?", (jti,)
+        ).fetchone()
+        return row is not None
+
+    def get_meta(self, key, default=None):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row["value"]
+
+    def set_meta(self, key, value):
+        self._connect().execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    def migrate_from_json(self, json_path=USER_DATA_FILE, batch_size=MIGRATION_BATCH_SIZE):
+        """Stream accounts from the legacy JSON file into the database once."""
+        if not os.path.exists(json_path):
+            return 0
+        marker = f"{os.path.getsize(json_path)}:{os.path.getmtime(json_path)}"
+        if self.get_meta("migrated_json") == marker:
+            return 0
+
+        migrated = 0
+        batch = []
+        for email, record in iter_json_users(json_path):
+            batch.append((email, record))
+            if len(batch) >= batch_size:
+                migrated += self.add_many(batch)
+                batch = []
+        if batch:
+            migrated += self.add_many(batch)
+
+        self.set_meta("migrated_json", marker)
+        return migrated
+
+
+@st.cache_resource
+def get_user_store(path=USER_DB_FILE):
+    """Open the process-wide user store, migrating user_data.json on first use."""
+    store = UserStore(path)
+    store.migrate_from_json()
+    return store
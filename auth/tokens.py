@@ -0,0 +1,101 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Cookie that carries the remember-me token between browser sessions
+SESSION_COOKIE = "osce_session"
+
+# How long a remember-me token stays valid (seconds)
+TOKEN_TTL = 14 * 24 * 3600
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(secret, payload):
+    return _b64encode(hmac.new(secret, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(secret, email, username, ttl=TOKEN_TTL):
+    """Create a signed token of the form <payload>.<signature>."""
+    claims = {
+        "sub": email,
+        "name": username,
+        "exp": int(time.time()) + ttl,
+        "jti": secrets.token_urlsafe(12),
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(secret, payload)}"
+
+
+def verify_token(secret, token):
+    """Return the token's claims if the signature is valid and it hasn't expired, else None.
+
+    This only checks the HMAC; callers check revocation when they act on it.
+    """
+    if not token or token.count(".") != 1:
+        return None
+    payload, signature = token.split(".")
+    # The cookie is client-controlled: any text that can't be encoded,
+    # compared or decoded is just an invalid token
+    try:
+        if not hmac.compare_digest(signature.encode("ascii"), _sign(secret, payload).encode("ascii")):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(claims, dict) or not isinstance(claims.get("exp"), (int, float)):
+        return None
+    if claims["exp"] < time.time():
+        return None
+    return claims
+
+
+@st.cache_resource
+def get_token_secret():
+    """Signing key from OSCE_TOKEN_SECRET.
+
+    Without it a random key is generated per process, so tokens stop working
+    after a restart (and across processes) and students simply log in again.
+    """
+    secret = os.environ.get("OSCE_TOKEN_SECRET")
+    if secret:
+        return secret.encode("utf-8")
+    logger.warning(
+        "OSCE_TOKEN_SECRET is not set; using a random per-process key. Remember-me "
+        "logins will not survive a restart or work across several app processes."
+    )
+    return secrets.token_bytes(32)
+
+
+def _write_cookie(value, max_age):
+    # Mark the cookie Secure whenever the page itself was served over https
+    st.html(
+        f"<script>document.cookie = "
+        f"'{SESSION_COOKIE}={value}; max-age={max_age}; path=/; SameSite=Strict' + "
+        f"(location.protocol === 'https:' ? '; Secure' : '');</script>",
+        unsafe_allow_javascript=True,
+    )
+
+
+def set_session_cookie(token, max_age=TOKEN_TTL):
+    """Store the token in a browser cookie."""
+    _write_cookie(token, max_age)
+
+
+def clear_session_cookie():
+    _write_cookie("", 0)
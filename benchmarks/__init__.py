@@ -0,0 +1,2 @@
+# Makes the benchmarks module a package
+# Run with python -m benchmarks.<name>
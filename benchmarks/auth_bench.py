@@ -0,0 +1,282 @@
+"""Authentication throughput benchmarks at different user-store sizes.
+
+Usage:
+    python -m benchmarks.auth_bench                     # 1k, 10k and 100k users
+    python -m benchmarks.auth_bench --sizes 1000 --compare benchmarks/results/auth-old.json
+
+Each size runs in a fresh subprocess against a synthetic SQLite store, so
+cold-start numbers are not flattered by caches from a previous size. The
+signup/login/unknown-email numbers are measured both directly against the
+auth package and end-to-end through Main Page.py with Streamlit's AppTest
+harness. Results are written as JSON to benchmarks/results/ and can be
+compared with an earlier report.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PAGE = os.path.join(ROOT, "Main Page.py")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Known account used for the login measurements
+BENCH_PASSWORD = "Bench1234"
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def latency_summary(samples):
+    """Operations per second plus p50/p95 latency in milliseconds."""
+    return {
+        "ops_per_sec": len(samples) / sum(samples) if sum(samples) else 0.0,
+        "p50_ms": percentile(samples, 0.5) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+    }
+
+
+def build_store(path, size, cost):
+    """Create a synthetic store with size accounts sharing one password hash."""
+    from auth.passwords import hash_password
+    from auth.store import UserStore
+
+    store = UserStore(path)
+    password_hash = hash_password(BENCH_PASSWORD, cost)
+    batch = []
+    for i in range(size):
+        batch.append((f"student{i}@bench.test", {
+            "password": password_hash,
+            "username": f"student{i}",
+            "created_at": "2024-01-01",
+        }))
+        if len(batch) == 5000:
+            store.add_many(batch)
+            batch = []
+    if batch:
+        store.add_many(batch)
+    return store
+
+
+def app_login(email, password, registered=True):
+    """Submit the Sign In form through AppTest and return the elapsed seconds.
+
+    Raises RuntimeError unless the page did what it should (log in, or for
+    unregistered emails say so), so a broken sign-in can't pass for a fast one.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(MAIN_PAGE, default_timeout=30).run()
+    at.text_input[0].input(email)
+    at.text_input[1].input(password)
+    started = time.perf_counter()
+    at.button[0].click().run()
+    elapsed = time.perf_counter() - started
+
+    logged_in = "logged_in" in at.session_state and at.session_state["logged_in"]
+    errors = [e.value for e in at.error]
+    if registered:
+        ok = logged_in and not errors
+    else:
+        ok = not logged_in and any("is not registered" in e for e in errors)
+    if at.exception or not ok:
+        problems = [e.value for e in at.exception] + errors
+        raise RuntimeError(f"Sign in as {email} did not behave as expected: {problems or 'no error shown'}")
+    return elapsed
+
+
+def run_size(size, samples, sessions, cost):
+    """Measure one store size; runs inside the worker subprocess."""
+    from streamlit.testing.v1 import AppTest
+
+    from auth.directory import UserDirectory
+    from auth.passwords import PasswordService
+    from auth.store import USER_DB_FILE
+
+    result = {"users": size}
+
+    started = time.perf_counter()
+    store = build_store(USER_DB_FILE, size, cost)
+    result["build_store_sec"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    directory = UserDirectory(store)
+    result["directory_load_sec"] = time.perf_counter() - started
+
+    # Signups: single-row insert plus copy-on-write snapshot swap
+    timings = []
+    for i in range(samples):
+        record = {"password": "x", "username": f"new{i}", "created_at": "2024-01-01"}
+        started = time.perf_counter()
+        directory.add(f"new{i}@bench.test", record)
+        timings.append(time.perf_counter() - started)
+    result["signup"] = latency_summary(timings)
+
+    # Logins: directory lookup and password verification
+    passwords = PasswordService(workers=1, cost=cost)
+    lookups, verifies = [], []
+    for i in range(samples):
+        email = f"student{(i * 7919) % size}@bench.test"
+        started = time.perf_counter()
+        record = directory.lookup(email)
+        lookups.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        passwords.verify(BENCH_PASSWORD, record["password"])
+        verifies.append(time.perf_counter() - started)
+    result["login_lookup"] = latency_summary(lookups)
+    result["login_verify"] = latency_summary(verifies)
+
+    # Unknown emails
+    timings = []
+    for i in range(samples):
+        started = time.perf_counter()
+        directory.lookup(f"missing{i}@bench.test")
+        timings.append(time.perf_counter() - started)
+    result["unknown_email"] = latency_summary(timings)
+
+    # Cold session: the first AppTest run in this process loads the directory
+    started = time.perf_counter()
+    AppTest.from_file(MAIN_PAGE, default_timeout=120).run()
+    result["cold_session_sec"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    AppTest.from_file(MAIN_PAGE, default_timeout=30).run()
+    result["warm_session_sec"] = time.perf_counter() - started
+
+    # End-to-end through the Sign In form (distinct emails so rate limits don't kick in)
+    app_samples = max(1, samples // 10)
+    result["app_login"] = latency_summary([
+        app_login(f"student{(i * 104729) % size}@bench.test", BENCH_PASSWORD)
+        for i in range(app_samples)
+    ])
+    result["app_unknown_email"] = latency_summary([
+        app_login(f"nobody{i}@bench.test", BENCH_PASSWORD, registered=False)
+        for i in range(app_samples)
+    ])
+
+    # Memory held per open session
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    open_sessions = [AppTest.from_file(MAIN_PAGE, default_timeout=30).run() for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    result["memory_per_session_kb"] = (after - before) / len(open_sessions) / 1024
+
+    return result
+
+
+def run_worker(args):
+    result = run_size(args.size, args.samples, args.sessions, args.cost)
+    json.dump(result, sys.stdout)
+
+
+def run_all(args):
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip(),
+        "python": platform.python_version(),
+        "password_cost": args.cost,
+        "samples": args.samples,
+        "results": [],
+    }
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, OSCE_USER_DB=os.path.join(tmp, "users.db"), PASSWORD_COST=str(args.cost))
+            print(f"Benchmarking {size} users...", file=sys.stderr)
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.auth_bench", "--worker", "--size", str(size),
+                 "--samples", str(args.samples), "--sessions", str(args.sessions), "--cost", str(args.cost)],
+                cwd=tmp, env=dict(env, PYTHONPATH=ROOT), capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                sys.exit(proc.stderr)
+            report["results"].append(json.loads(proc.stdout))
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = args.output or os.path.join(
+        RESULTS_DIR, f"auth-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {out_path}", file=sys.stderr)
+
+    print_report(report)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare_reports(json.load(f), report)
+
+
+METRICS = [
+    ("directory_load_sec", "directory load (s)"),
+    ("cold_session_sec", "cold session (s)"),
+    ("warm_session_sec", "warm session (s)"),
+    ("signup.ops_per_sec", "signups/s"),
+    ("login_lookup.ops_per_sec", "login lookups/s"),
+    ("login_verify.ops_per_sec", "password verifies/s"),
+    ("unknown_email.p95_ms", "unknown email p95 (ms)"),
+    ("app_login.ops_per_sec", "app logins/s"),
+    ("app_unknown_email.p95_ms", "app unknown email p95 (ms)"),
+    ("memory_per_session_kb", "memory/session (KB)"),
+]
+
+
+def metric(result, name):
+    value = result
+    for part in name.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def print_report(report):
+    for result in report["results"]:
+        print(f"\n{result['users']} users")
+        for name, label in METRICS:
+            print(f"  {label:<28} {metric(result, name):>12.3f}")
+
+
+def compare_reports(old, new):
+    print(f"\nChange from {old.get('commit')} to {new.get('commit')}")
+    old_by_size = {r["users"]: r for r in old["results"]}
+    for result in new["results"]:
+        previous = old_by_size.get(result["users"])
+        if previous is None:
+            continue
+        print(f"\n{result['users']} users")
+        for name, label in METRICS:
+            before, after = metric(previous, name), metric(result, name)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else 0.0
+            print(f"  {label:<28} {before:>12.3f} -> {after:>12.3f} ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sign-up and sign-in at several store sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--samples", type=int, default=200, help="Operations timed per measurement")
+    parser.add_argument("--sessions", type=int, default=20, help="Sessions opened for the memory measurement")
+    parser.add_argument("--cost", type=int, default=2 ** 12, help="scrypt cost used for benchmark passwords")
+    parser.add_argument("--output", help="Report path (default: benchmarks/results/auth-<time>.json)")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        run_worker(args)
+    else:
+        run_all(args)
+
+
+if __name__ == "__main__":
+    main()
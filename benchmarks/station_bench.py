@@ -0,0 +1,101 @@
+"""Script time per checklist interaction in the step-runner stations.
+
+Usage:
+    python -m benchmarks.station_bench
+    python -m benchmarks.station_bench --rounds 5 --output benchmarks/results/stations.json
+
+Drives the knee and shoulder stations through Streamlit's AppTest harness,
+ticking every checklist item, and reads the runner's own timings. "Before"
+is the station script a tick used to rerun in full; "after" is the checklist
+fragment a tick now reruns on its own (AppTest always reruns the whole page,
+so the fragment time is taken from the runner's per-scope timings). The
+browser-side checklist can't be driven from AppTest, so the benchmark runs
+with plain checkboxes (OSCE_CLIENT_CHECKLIST=0).
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRACTICE_PAGE = os.path.join(ROOT, "pages", "2_Practice.py")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+STATIONS = {
+    "msk-knee": [],
+    "msk-shoulder": ["Start Analysis", "Start OSCE Practice"],
+}
+
+
+def click(at, label):
+    for button in at.button:
+        if button.label == label:
+            button.click()
+            return at.run()
+    raise RuntimeError(f"No '{label}' button on the page")
+
+
+def run_station(station_id, buttons):
+    """Tick every item of every step; return the page time per tick in seconds."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PRACTICE_PAGE, default_timeout=30)
+    at.session_state.logged_in = True
+    at.session_state.selected_station = station_id
+    at.run()
+    for label in buttons + ["Start Station"]:
+        at = click(at, label)
+
+    page_times = []
+    while any(button.label == "Next Step" for button in at.button):
+        for i in range(len(at.checkbox)):
+            at.checkbox[i].check()
+            started = time.perf_counter()
+            at.run()
+            page_times.append(time.perf_counter() - started)
+        at = click(at, "Next Step")
+    return page_times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time checklist interactions in the station runner.")
+    parser.add_argument("--rounds", type=int, default=3, help="Times each station is completed")
+    parser.add_argument("--output", help="Report path (default: benchmarks/results/stations-<time>.json)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("OSCE_CLIENT_CHECKLIST", "0")
+    from stations.runner import runner_stats
+
+    page_times = []
+    for station_id, buttons in STATIONS.items():
+        for _ in range(args.rounds):
+            page_times.extend(run_station(station_id, buttons))
+
+    stats = runner_stats()
+    report = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "ticks": len(page_times),
+        "page_ms": sum(page_times) / len(page_times) * 1000,
+        "before_ms": stats["station"]["mean_ms"],
+        "after_ms": stats["checklist"]["mean_ms"],
+        "scopes": stats,
+    }
+
+    out_path = args.output or os.path.join(
+        RESULTS_DIR, f"stations-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {out_path}", file=sys.stderr)
+
+    print(f"{report['ticks']} checklist ticks")
+    print(f"  {'whole page rerun (ms)':<34} {report['page_ms']:>10.3f}")
+    print(f"  {'station script, before (ms)':<34} {report['before_ms']:>10.3f}")
+    print(f"  {'checklist fragment, after (ms)':<34} {report['after_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,26 @@
 import streamlit as st
 
+from auth.store import get_user_store
+from auth.tokens import set_session_cookie
+from ui.payload import meter_payload
+from ui.session import clear_session, track_session
+from ui.theme import apply_theme
+
 # Page config
 st.set_page_config(page_title="Dashboard - OSCE App", page_icon="🩺", layout="wide")
+meter_payload("Dashboard")
+track_session()
+apply_theme()
 
 # Check if logged in
 if not st.session_state.get("logged_in", False):
     st.warning("Please log in to access this page.")
     st.switch_page("Main Page.py")
 
+# Save the remember-me token issued at login in a browser cookie
+if "remember_token" in st.session_state:
+    set_session_cookie(st.session_state.pop("remember_token"))
+
 # Display header and welcome
 st.title("OSCE Practice Dashboard")
 st.write(f"Welcome, {st.session_state.get('username', 'User')}! 👋")
@@ -47,16 +60,20 @@ st.markdown("---")
 
 # Add Log Out button at the bottom of the page
 if st.button("Log Out 🔒", key="logout_btn"):
-    # Clear session state except for registered users
-    for key in list(st.session_state.keys()):
-        if key != "registered_users":  # Keep the registered users data
-            del st.session_state[key]
+    # Revoke the remember-me token so the cookie can't log back in
+    claims = st.session_state.get("session_claims")
+    if claims:
+        get_user_store().revoke_token(claims["jti"], claims["exp"])
+
+    # Clear session state (accounts live in the shared user directory)
+    clear_session()
+    st.session_state.clear_session_cookie = True
     st.success("You've been logged out.")
     st.switch_page("Main Page.py")
 
 # Display version
 st.markdown("""
-<div style="text-align: center; color: #888; margin-top: 50px;">
+<div class="osce-footer osce-footer-version">
     <small>OSCE Practice App v1.0</small>
 </div>
 """, unsafe_allow_html=True)
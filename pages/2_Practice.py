@@ -1,7 +1,12 @@
 import streamlit as st
 import os
 import sys
-import importlib.util
+
+from stations.registry import (get_station, import_error, is_available, load_catalog, load_entry_point,
+                               station_time_limit)
+from ui.payload import meter_payload
+from ui.session import track_session
+from ui.theme import apply_theme
 
 # Set page config
 st.set_page_config(
@@ -9,73 +14,36 @@ st.set_page_config(
     page_icon="🏥",
     layout="wide"
 )
+meter_payload("Practice")
+track_session()
+apply_theme()
 
 # Check if logged in - using your authentication system
 if not st.session_state.get("logged_in", False):
     st.warning("Please log in to access this page.")
     st.switch_page("Main Page.py")  # Maintain your original redirect
 
-# Safe import function
-def safe_import_module(module_name, function_name):
-    """Safely import a function from a module, returning None if it fails."""
-    try:
-        # Check if module exists and can be imported
-        module_spec = importlib.util.find_spec(module_name)
-        if module_spec is None:
-            return None
-            
-        # Import the module
-        module = importlib.import_module(module_name)
-        
-        # Get the function
-        if hasattr(module, function_name):
-            return getattr(module, function_name)
-        return None
-    except Exception as e:
-        st.error(f"Error importing {module_name}: {e}")
-        return None
-
-# Safely import station display functions
-display_shoulder_station = safe_import_module("stations.msk.shoulder", "display_station")
-display_knee_station = safe_import_module("stations.msk.knee", "display_station")
+# Load the station catalog (category packages register their stations).
+# Station modules themselves are only imported when a student opens one.
+catalog = load_catalog()
 
 # Check if we're in a specific station mode
 if "selected_station" in st.session_state:
-    selected = st.session_state.selected_station
+    station = get_station(st.session_state.selected_station)
     
-    # Display the appropriate station based on selection
-    if "MSK Station 1: Shoulder Examination" in selected:
-        if display_shoulder_station:
-            display_shoulder_station()
-        else:
-            st.error("The shoulder examination station module is missing or has an error.")
-            st.info("This station is currently under development.")
-    elif "MSK Station 2: Knee Examination" in selected:
-        if display_knee_station:
-            display_knee_station()
-        else:
-            st.error("The knee examination station module is missing or has an error.")
-            st.info("This station is currently under development.")
-    elif "Cardio Station 1: Cardiovascular Examination" in selected:
-        st.title("Cardiovascular Examination Station")
-        st.info("This station is under development. Please check back later.")
-    elif "Cardio Station 2: Respiratory Examination" in selected:
-        st.title("Respiratory Examination Station")
-        st.info("This station is under development. Please check back later.")
-    elif "Neuro Station 1: Cranial Nerve Examination" in selected:
-        st.title("Cranial Nerve Examination Station")
-        st.info("This station is under development. Please check back later.")
-    elif "Neuro Station 2: Upper Limb Neurological Examination" in selected:
-        st.title("Upper Limb Neurological Examination Station")
-        st.info("This station is under development. Please check back later.")
-    elif "Geriatric Station" in selected:
-        st.title("Comprehensive Geriatric Assessment Station")
-        st.info("This station is under development. Please check back later.")
-    elif "Paediatric Station" in selected:
-        st.title("Paediatric Developmental Assessment Station")
+    # Display the selected station
+    if station is None:
+        st.error(f"Unknown station: {st.session_state.selected_station}")
+    elif station.entry_point is None:
+        st.title(f"{station.title.split(': ', 1)[-1]} Station")
         st.info("This station is under development. Please check back later.")
     else:
-        st.error(f"Unknown station: {selected}")
+        display_station = load_entry_point(station)
+        if display_station:
+            display_station()
+        else:
+            st.error(f"The {station.title} module is missing or has an error: {import_error(station)}")
+            st.info("This station is currently under development.")
     
     # Clear selection if user wants to select a different station
     if st.sidebar.button("← Return to Station Selection"):
@@ -89,68 +57,8 @@ if "selected_station" in st.session_state:
 st.title("OSCE Practice Stations")
 st.write("Select a station to begin practicing your clinical skills.")
 
-# Station categories and descriptions
-stations = {
-    "Musculoskeletal": [
-        {
-            "title": "MSK Station 1: Shoulder Examination",
-            "description": "Practice a focused examination of the shoulder joint.",
-            "difficulty": "Moderate",
-            "time": "8 minutes"
-        },
-        {
-            "title": "MSK Station 2: Knee Examination",
-            "description": "Conduct a comprehensive assessment of the knee joint.",
-            "difficulty": "Moderate",
-            "time": "8 minutes"
-        }
-    ],
-    "Cardiorespiratory": [
-        {
-            "title": "Cardio Station 1: Cardiovascular Examination",
-            "description": "Perform a systematic cardiovascular examination.",
-            "difficulty": "Challenging",
-            "time": "8 minutes"
-        },
-        {
-            "title": "Cardio Station 2: Respiratory Examination",
-            "description": "Complete a thorough respiratory system examination.",
-            "difficulty": "Moderate",
-            "time": "8 minutes"
-        }
-    ],
-    "Neurology": [
-        {
-            "title": "Neuro Station 1: Cranial Nerve Examination",
-            "description": "Assess the 12 cranial nerves systematically.",
-            "difficulty": "Challenging",
-            "time": "10 minutes"
-        },
-        {
-            "title": "Neuro Station 2: Upper Limb Neurological Examination",
-            "description": "Perform a focused neurological examination of the upper limb.",
-            "difficulty": "Moderate",
-            "time": "8 minutes"
-        }
-    ],
-    "Specialty": [
-        {
-            "title": "Geriatric Station: Comprehensive Geriatric Assessment",
-            "description": "Perform key elements of a geriatric assessment.",
-            "difficulty": "Moderate",
-            "time": "10 minutes"
-        },
-        {
-            "title": "Paediatric Station: Developmental Assessment",
-            "description": "Conduct age-appropriate developmental screening.",
-            "difficulty": "Challenging",
-            "time": "8 minutes"
-        }
-    ]
-}
-
 # Display stations by category
-for category, category_stations in stations.items():
+for category, category_stations in catalog.items():
     st.header(category)
     
     # Create two columns per category row
@@ -161,25 +69,20 @@ for category, category_stations in stations.items():
         col_idx = idx % 2  # Alternate between columns 0 and 1
         
         with cols[col_idx]:
-            st.subheader(station["title"])
-            st.write(station["description"])
-            st.write(f"**Difficulty:** {station['difficulty']}")
-            st.write(f"**Time:** {station['time']}")
+            st.subheader(station.title)
+            st.write(station.description)
+            st.write(f"**Difficulty:** {station.difficulty}")
+            st.write(f"**Time:** {station_time_limit(station)} minutes")
             
-            # Button to start this station
-            button_label = "Start Station"
-            
-            # Only enable buttons for implemented stations
-            # Check if the specific station modules exist
-            if "MSK Station 1" in station["title"] and display_shoulder_station:
-                disabled = False
-            elif "MSK Station 2" in station["title"] and display_knee_station:
+            # Only enable buttons for implemented stations that haven't failed to import
+            if is_available(station):
+                button_label = "Start Station"
                 disabled = False
             else:
                 button_label = "Coming Soon"
                 disabled = True
                 
-            if st.button(button_label, key=f"btn_{station['title']}", disabled=disabled):
+            if st.button(button_label, key=f"btn_{station.id}", disabled=disabled):
                 # Store the selected station in session state
-                st.session_state.selected_station = station["title"]
+                st.session_state.selected_station = station.id
                 st.rerun()  # Updated from experimental_rerun()
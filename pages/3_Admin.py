@@ -0,0 +1,120 @@
+import os
+import time
+
+import streamlit as st
+
+from auth.passwords import get_password_service
+from auth.store import get_user_store
+from stations.registry import import_stats
+from stations.render import render_stats
+from ui.payload import meter_payload, payload_stats
+from ui.session import session_sizes, sweeper_stats, track_session
+from ui.theme import apply_theme
+
+# Account emails allowed to see this page, comma-separated
+ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get("OSCE_ADMIN_EMAILS", "").split(",") if e.strip()}
+
+
+def is_admin():
+    """True if this session signed in to an admin account with a password or token.
+
+    The email comes from the signed session claims, so the test account and
+    lookalike usernames never match.
+    """
+    claims = st.session_state.get("session_claims") or {}
+    email = claims.get("sub")
+    if not email or email.strip().lower() not in ADMIN_EMAILS:
+        return False
+    store = get_user_store()
+    return store.get(email) is not None and not store.is_token_revoked(claims["jti"])
+
+
+# Page config
+st.set_page_config(page_title="Admin - OSCE App", page_icon="🛠️", layout="wide")
+meter_payload("Admin")
+track_session()
+apply_theme()
+
+# Check if logged in as an admin
+if not st.session_state.get("logged_in", False):
+    st.warning("Please log in to access this page.")
+    st.switch_page("Main Page.py")
+if not is_admin():
+    st.warning("This page is for administrators only.")
+    st.stop()
+
+st.title("🛠️ Session Memory")
+st.caption("Approximate bytes held in session state, per live session and namespace.")
+
+sessions = session_sizes()
+sweeper = sweeper_stats()
+now = time.time()
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Live sessions", len(sessions))
+col2.metric("Total session state", f"{sum(s['total_bytes'] for s in sessions) / 1024:.1f} KB")
+col3.metric("Spilled to disk", sweeper["files"], help=f"{sweeper['bytes'] / 1024:.1f} KB on disk")
+col4.metric("Dropped as abandoned", sweeper["dropped"])
+st.caption(f"Spilled {sweeper['spilled']} idle sessions and read back {sweeper['rehydrated']} since startup.")
+
+# One row per session, one column per namespace
+rows = []
+totals = {}
+for s in sessions:
+    row = {
+        "User": s["user"] or "-",
+        "Session": s["session_id"][:8],
+        "Idle (s)": int(now - s["last_seen"]),
+        "Spilled": s["spilled"],
+        "Total (KB)": round(s["total_bytes"] / 1024, 1),
+    }
+    for name, size in s["namespaces"].items():
+        row[f"{name} (KB)"] = round(size / 1024, 1)
+        totals[name] = totals.get(name, 0) + size
+    rows.append(row)
+
+if rows:
+    st.markdown("### Sessions")
+    st.dataframe(rows, width="stretch", hide_index=True)
+
+    st.markdown("### By namespace")
+    st.bar_chart({name: [size / 1024] for name, size in totals.items()}, y_label="KB")
+else:
+    st.info("No live sessions.")
+
+st.markdown("### Station modules")
+modules = import_stats()
+if modules:
+    st.dataframe([
+        {"Module": name, "Import (ms)": round(m["seconds"] * 1000, 1), "Error": m["error"] or ""}
+        for name, m in sorted(modules.items())
+    ], width="stretch", hide_index=True)
+else:
+    st.caption("No station modules imported yet.")
+
+st.markdown("### Rendered content cache")
+cache = render_stats()
+col1, col2, col3 = st.columns(3)
+col1.metric("Blocks cached", cache["entries"])
+col2.metric("Hits", cache["hits"])
+col3.metric("Misses", cache["misses"])
+
+st.markdown("### Rerun payloads")
+payloads = payload_stats()
+if payloads:
+    st.dataframe([
+        {"Page": page, "Reruns": p["runs"], "Mean (KB)": round(p["mean_bytes"] / 1024, 1),
+         "Last (KB)": round(p["last_bytes"] / 1024, 1), "Max (KB)": round(p["max_bytes"] / 1024, 1)}
+        for page, p in sorted(payloads.items())
+    ], width="stretch", hide_index=True)
+else:
+    st.caption("No reruns measured yet.")
+
+st.markdown("### Password hashing pool")
+hashing = get_password_service().stats()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Queued or running", hashing["pending"])
+col2.metric("Rejected as busy", hashing["rejected"])
+col3.metric("Wait p50 / p95", f"{hashing['wait_p50_ms']:.0f} / {hashing['wait_p95_ms']:.0f} ms")
+col4.metric("Hash p50 / p95", f"{hashing['run_p50_ms']:.0f} / {hashing['run_p95_ms']:.0f} ms")
+st.caption(f"{hashing['completed']} hashes completed since startup.")
@@ -4,6 +4,10 @@ import json
 import os
 from datetime import datetime
 
+from stations.components import is_supported as components_supported
+from stations.timer import client_timer
+from ui.session import namespace
+
 def load_scenarios():
     """Load patient scenarios from a JSON file."""
     # Check if the file exists, if not create it with sample data
@@ -95,47 +99,85 @@ def save_session_data(username, session_data):
     with open(history_file, "w") as f:
         json.dump(history, f)
 
+# SOAPIER subjective table: (label, widget key) for each field
+SUBJECTIVE_LABELS = [
+    "Name",
+    "Age",
+    "Gender",
+    "Race",
+    "Occupation",
+    "Date of Assessment",
+    "Doctor's Diagnosis",
+    "Doctor's Management",
+    "Investigation",
+    "Chief Complaint",
+    "Patient's Goal",
+]
+SUBJECTIVE_FIELDS = [
+    (label, "subj_" + label.lower().replace(' ', '_').replace("'", ''))
+    for label in SUBJECTIVE_LABELS
+]
+
+def subjective_placeholders(scenario):
+    """Map subjective field keys to the scenario's patient details, used as hints."""
+    details = {k.lower(): v for k, v in scenario.get("patient_details", {}).items()}
+    placeholders = {}
+    for label, key in SUBJECTIVE_FIELDS:
+        field_key = label.lower().replace(' ', '_').replace('\'s', '')
+        if field_key in details:
+            placeholders[key] = str(details[field_key])
+    return placeholders
+
 def format_time(seconds):
     """Format seconds into MM:SS display"""
     mins, secs = divmod(seconds, 60)
     return f"{mins:02d}:{secs:02d}"
 
+def show_stopwatch(label, started_at, elapsed):
+    """Stopwatch that keeps ticking in the browser between reruns."""
+    if components_supported():
+        timer_key = namespace("station1").key(f"{label.lower().replace(' ', '_')}_timer")
+        client_timer(timer_key, label, started_at, boxed=False)
+    else:
+        st.markdown(f"<h2 style='text-align: center;'>{label}: {format_time(elapsed)}</h2>", unsafe_allow_html=True)
+
 def display_station1():
     st.title("Station 1: History Taking + VIVA")
+    ns = namespace("station1")
     
     # Initialize session state variables if they don't exist
-    if 'station1_phase' not in st.session_state:
-        st.session_state.station1_phase = 'intro'
-    if 'start_time' not in st.session_state:
-        st.session_state.start_time = None
-    if 'history_notes' not in st.session_state:
-        st.session_state.history_notes = ""
-    if 'checked_items' not in st.session_state:
-        st.session_state.checked_items = []
-    if 'viva_answers' not in st.session_state:
-        st.session_state.viva_answers = {}
-    if 'subjective_data' not in st.session_state:
-        st.session_state.subjective_data = {}
-    if 'selected_scenario' not in st.session_state:
+    if 'station1_phase' not in ns:
+        ns["station1_phase"] = 'intro'
+    if 'start_time' not in ns:
+        ns["start_time"] = None
+    if 'history_notes' not in ns:
+        ns["history_notes"] = ""
+    if 'checked_items' not in ns:
+        ns["checked_items"] = []
+    if 'viva_answers' not in ns:
+        ns["viva_answers"] = {}
+    if 'subjective_data' not in ns:
+        ns["subjective_data"] = {}
+    if 'selected_scenario' not in ns:
         scenarios = load_scenarios()
         if scenarios:
-            st.session_state.selected_scenario = scenarios[0]  # Default to first scenario
+            ns["selected_scenario"] = scenarios[0]  # Default to first scenario
         else:
             st.error("No scenarios available. Please add scenarios to the database.")
             return
     
     # Intro phase - select scenario and start
-    if st.session_state.station1_phase == 'intro':
+    if ns["station1_phase"] == 'intro':
         scenarios = load_scenarios()
         scenario_titles = [s["title"] for s in scenarios]
         selected_title = st.selectbox("Select a scenario:", scenario_titles)
         
         for scenario in scenarios:
             if scenario["title"] == selected_title:
-                st.session_state.selected_scenario = scenario
+                ns["selected_scenario"] = scenario
                 # Initialize subjective data with empty values
                 if scenario.get("patient_details"):
-                    st.session_state.subjective_data = {k: "" for k in scenario["patient_details"].keys()}
+                    ns["subjective_data"] = {k: "" for k in scenario["patient_details"].keys()}
                 break
         
         st.markdown("### Instructions:")
@@ -145,139 +187,138 @@ def display_station1():
         st.markdown("4. You'll start with a Subjective assessment (SOAPIER format)")
         
         if st.button("Start Station 1"):
-            st.session_state.station1_phase = 'history'
-            st.session_state.start_time = time.time()
+            ns["station1_phase"] = 'history'
+            ns["start_time"] = time.time()
             st.rerun()
     
     # History taking phase
-    elif st.session_state.station1_phase == 'history':
-        scenario = st.session_state.selected_scenario
-        elapsed_time = int(time.time() - st.session_state.start_time)
+    elif ns["station1_phase"] == 'history':
+        scenario = ns["selected_scenario"]
+        elapsed_time = int(time.time() - ns["start_time"])
         
         # Display stopwatch instead of countdown
-        time_text = format_time(elapsed_time)
-        st.markdown(f"<h2 style='text-align: center;'>History Taking: {time_text}</h2>", unsafe_allow_html=True)
+        show_stopwatch("History Taking", ns["start_time"], elapsed_time)
         
         # Display scenario
         st.markdown("### Patient Scenario")
         st.markdown(scenario["description"])
         
-        # Subjective assessment table (SOAPIER)
-        st.markdown("### Subjective Assessment")
-        
-        # Create a two-column layout for the table
-        col1, col2 = st.columns(2)
-        
-        # Define subjective components
-        subjective_components = {
-            "Name": "",
-            "Age": "",
-            "Gender": "",
-            "Race": "",
-            "Occupation": "",
-            "Date of Assessment": datetime.now().strftime("%Y-%m-%d"),
-            "Doctor's Diagnosis": "",
-            "Doctor's Management": "",
-            "Investigation": "",
-            "Chief Complaint": "",
-            "Patient's Goal": ""
-        }
-        
-        # Display form fields for subjective data
-        for i, (label, default_value) in enumerate(subjective_components.items()):
+        # Subjective table, checklist and notes are one form, so typing
+        # doesn't rerun the page; everything is stored in one go on submit
+        placeholders = subjective_placeholders(scenario)
+        with st.form("station1_history_form", clear_on_submit=False):
+            # Subjective assessment table (SOAPIER)
+            st.markdown("### Subjective Assessment")
+            
+            # Create a two-column layout for the table
+            col1, col2 = st.columns(2)
+            
+            # Display form fields for subjective data
+            entered = {}
+            for label, key in SUBJECTIVE_FIELDS:
+                with col1:
+                    st.markdown(f"**{label}:**")
+                with col2:
+                    entered[key] = st.text_input(
+                        label,
+                        key=ns.key(key),
+                        value=ns["subjective_data"].get(key, ""),
+                        placeholder=placeholders.get(key, ""),
+                        label_visibility="collapsed"
+                    )
+            
+            # History taking checklist
+            st.markdown("### Key History Points")
+            for i, point in enumerate(scenario["key_history_points"]):
+                st.checkbox(point, key=ns.key(f"history_point_{i}"),
+                            value=f"history_point_{i}" in ns["checked_items"])
+            
+            # Notes section
+            st.markdown("### Your Notes")
+            notes = st.text_area("Enter your notes here:", 
+                                 value=ns["history_notes"],
+                                 height=200)
+            
+            col1, col2 = st.columns(2)
             with col1:
-                st.markdown(f"**{label}:**")
+                saved = st.form_submit_button("Save Answers")
             with col2:
-                key = f"subj_{label.lower().replace(' ', '_').replace(''', '')}"
-                
-                # Use the patient details as placeholder hints if available
-                placeholder = ""
-                if scenario.get("patient_details"):
-                    field_key = label.lower().replace(' ', '_').replace('\'s', '').replace('doctor\'s', 'doctor')
-                    for scenario_key in scenario["patient_details"].keys():
-                        if scenario_key.lower() == field_key:
-                            placeholder = scenario["patient_details"][scenario_key]
-                
-                # Store input in session state
-                st.session_state.subjective_data[key] = st.text_input(
-                    "", 
-                    key=key,
-                    value=st.session_state.subjective_data.get(key, ""),
-                    placeholder=placeholder
-                )
-        
-        # History taking checklist
-        st.markdown("### Key History Points")
-        for i, point in enumerate(scenario["key_history_points"]):
-            key = f"history_point_{i}"
-            checked = st.checkbox(point, key=key)
-            if checked and key not in st.session_state.checked_items:
-                st.session_state.checked_items.append(key)
+                # Manual transition button
+                proceed = st.form_submit_button("Proceed to VIVA")
         
-        # Notes section
-        st.markdown("### Your Notes")
-        st.session_state.history_notes = st.text_area("Enter your notes here:", 
-                                                     value=st.session_state.history_notes,
-                                                     height=200)
+        if saved or proceed:
+            # Store the whole batch once
+            ns["subjective_data"].update(
+                {key: value.strip() for key, value in entered.items()}
+            )
+            ns["checked_items"] = [
+                f"history_point_{i}" for i in range(len(scenario["key_history_points"]))
+                if ns.widget_value(f"history_point_{i}")
+            ]
+            ns["history_notes"] = notes
+            
+            filled = sum(1 for key in entered if ns["subjective_data"][key])
+            if filled < len(SUBJECTIVE_FIELDS):
+                st.info(f"Saved. {filled}/{len(SUBJECTIVE_FIELDS)} subjective fields filled in.")
+            else:
+                st.success("Saved.")
         
-        # Manual transition button
-        if st.button("Proceed to VIVA"):
-            st.session_state.history_end_time = time.time()  # Record when history phase ended
-            st.session_state.station1_phase = 'viva'
+        if proceed:
+            ns["history_end_time"] = time.time()  # Record when history phase ended
+            ns["station1_phase"] = 'viva'
             st.rerun()
     
     # VIVA phase
-    elif st.session_state.station1_phase == 'viva':
-        scenario = st.session_state.selected_scenario
+    elif ns["station1_phase"] == 'viva':
+        scenario = ns["selected_scenario"]
         
         # If history_end_time is not set, set it now
-        if 'history_end_time' not in st.session_state:
-            st.session_state.history_end_time = time.time()
+        if 'history_end_time' not in ns:
+            ns["history_end_time"] = time.time()
         
         # Calculate elapsed time for history phase
-        history_elapsed = int(st.session_state.history_end_time - st.session_state.start_time)
+        history_elapsed = int(ns["history_end_time"] - ns["start_time"])
         
         # Calculate elapsed time for VIVA phase
-        viva_elapsed = int(time.time() - st.session_state.history_end_time)
+        viva_elapsed = int(time.time() - ns["history_end_time"])
         
         # Display stopwatch
-        time_text = format_time(viva_elapsed)
-        st.markdown(f"<h2 style='text-align: center;'>VIVA Session: {time_text}</h2>", unsafe_allow_html=True)
+        show_stopwatch("VIVA Session", ns["history_end_time"], viva_elapsed)
         
         # Display VIVA questions
         st.markdown("### VIVA Questions")
         for i, question in enumerate(scenario["viva_questions"]):
             st.markdown(f"**Q{i+1}: {question}**")
             answer_key = f"viva_answer_{i}"
-            st.session_state.viva_answers[answer_key] = st.text_area(
+            ns["viva_answers"][answer_key] = st.text_area(
                 f"Your answer to Q{i+1}:", 
-                value=st.session_state.viva_answers.get(answer_key, ""),
-                key=answer_key
+                value=ns["viva_answers"].get(answer_key, ""),
+                key=ns.key(answer_key)
             )
         
         # Manual finish button
         if st.button("Finish Station"):
-            st.session_state.viva_end_time = time.time()  # Record when VIVA phase ended
-            st.session_state.station1_phase = 'summary'
+            ns["viva_end_time"] = time.time()  # Record when VIVA phase ended
+            ns["station1_phase"] = 'summary'
             st.rerun()
     
     # Summary phase
-    elif st.session_state.station1_phase == 'summary':
+    elif ns["station1_phase"] == 'summary':
         st.markdown("## Station 1 Complete")
         st.markdown("### Summary")
         
-        scenario = st.session_state.selected_scenario
+        scenario = ns["selected_scenario"]
         
         # Calculate times
         history_time = "N/A"
         viva_time = "N/A"
         
-        if hasattr(st.session_state, 'history_end_time') and hasattr(st.session_state, 'start_time'):
-            history_seconds = int(st.session_state.history_end_time - st.session_state.start_time)
+        if 'history_end_time' in ns and 'start_time' in ns:
+            history_seconds = int(ns["history_end_time"] - ns["start_time"])
             history_time = format_time(history_seconds)
             
-        if hasattr(st.session_state, 'viva_end_time') and hasattr(st.session_state, 'history_end_time'):
-            viva_seconds = int(st.session_state.viva_end_time - st.session_state.history_end_time)
+        if 'viva_end_time' in ns and 'history_end_time' in ns:
+            viva_seconds = int(ns["viva_end_time"] - ns["history_end_time"])
             viva_time = format_time(viva_seconds)
         
         # Display time metrics
@@ -285,7 +326,7 @@ def display_station1():
         st.markdown(f"**VIVA Session Time:** {viva_time}")
         
         # Calculate performance metrics
-        checked_points = len(st.session_state.checked_items)
+        checked_points = len(ns["checked_items"])
         total_points = len(scenario["key_history_points"])
         history_percentage = (checked_points / total_points) * 100 if total_points > 0 else 0
         
@@ -296,7 +337,7 @@ def display_station1():
         # Display subjective data
         st.markdown("### Subjective Assessment")
         subjective_data_markdown = ""
-        for key, value in st.session_state.subjective_data.items():
+        for key, value in ns["subjective_data"].items():
             # Convert key from subj_name to Name
             display_key = key.replace('subj_', '').replace('_', ' ').title()
             subjective_data_markdown += f"**{display_key}:** {value}\n\n"
@@ -305,15 +346,15 @@ def display_station1():
         
         # Display history notes
         st.markdown("### Your History Notes")
-        st.text_area("", value=st.session_state.history_notes, height=150, disabled=True)
+        st.text_area("", value=ns["history_notes"], height=150, disabled=True)
         
         # Display VIVA answers
         st.markdown("### Your VIVA Responses")
         for i, question in enumerate(scenario["viva_questions"]):
             answer_key = f"viva_answer_{i}"
-            answer = st.session_state.viva_answers.get(answer_key, "")
+            answer = ns["viva_answers"].get(answer_key, "")
             st.markdown(f"**Q{i+1}: {question}**")
-            st.text_area("", value=answer, height=100, disabled=True, key=f"display_{answer_key}")
+            st.text_area("", value=answer, height=100, disabled=True, key=ns.key(f"display_{answer_key}"))
         
         # Save session data
         if st.button("Save Results"):
@@ -326,25 +367,16 @@ def display_station1():
                 "history_coverage": history_percentage,
                 "points_covered": checked_points,
                 "total_points": total_points,
-                "subjective_data": st.session_state.subjective_data,
-                "history_notes": st.session_state.history_notes,
-                "viva_answers": st.session_state.viva_answers
+                "subjective_data": ns["subjective_data"],
+                "history_notes": ns["history_notes"],
+                "viva_answers": ns["viva_answers"]
             }
             save_session_data(username, session_data)
             st.success("Session results saved successfully!")
         
         # Return to dashboard
         if st.button("Return to Dashboard"):
-            # Reset all session state variables
-            st.session_state.station1_phase = 'intro'
-            st.session_state.history_notes = ""
-            st.session_state.checked_items = []
-            st.session_state.viva_answers = {}
-            st.session_state.subjective_data = {}
-            st.session_state.start_time = None
-            if 'history_end_time' in st.session_state:
-                del st.session_state.history_end_time
-            if 'viva_end_time' in st.session_state:
-                del st.session_state.viva_end_time
+            # Reset all station state and widget values in one go
+            ns.clear()
             # Navigate back to dashboard
             st.switch_page("pages/1_Dashboard.py")
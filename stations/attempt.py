@@ -0,0 +1,78 @@
+class Attempt:
+    """One session's run through a compiled station.
+
+    Checklist ticks are kept as one bitmask per step, indexed by step number,
+    so recording a step is O(1) and going back and forth overwrites instead of
+    appending. Step names and item text are never copied; they are looked up
+    in the shared StationContent when needed.
+    """
+
+    __slots__ = ("station_id", "attempt_id", "started_at", "finished_at", "timed_out",
+                 "current_step", "ticks", "recorded", "notes", "ticked_at")
+
+    def __init__(self, content):
+        self.station_id = content.id
+        self.attempt_id = None
+        self.started_at = None
+        self.finished_at = None
+        self.timed_out = False
+        self.current_step = 0
+        self.ticks = [0] * len(content.steps)
+        self.recorded = 0  # Bitmask of steps saved with Next Step
+        self.notes = {}  # step index -> notes, only for steps with notes
+        self.ticked_at = {}  # step index -> tick times, only if the checklist reported them
+
+    def record_step(self, index, checked, notes="", ticked_at=None):
+        """Save a step's ticks (one flag per checklist item) and notes."""
+        mask = 0
+        for i, done in enumerate(checked):
+            if done:
+                mask |= 1 << i
+        self.ticks[index] = mask
+        self.recorded |= 1 << index
+        if notes:
+            self.notes[index] = notes
+        else:
+            self.notes.pop(index, None)
+        if ticked_at and any(ticked_at):
+            self.ticked_at[index] = tuple(ticked_at)
+        else:
+            self.ticked_at.pop(index, None)
+
+    def recorded_steps(self):
+        return [i for i in range(len(self.ticks)) if self.recorded >> i & 1]
+
+    def step_score(self, content, index):
+        """Return (ticked items, total items) for a step."""
+        return self.ticks[index].bit_count(), len(content.steps[index].checklist)
+
+    def score(self, content):
+        """Return (completed items, total items, percentage)."""
+        completed = sum(mask.bit_count() for mask in self.ticks)
+        return completed, content.total_items, (completed / content.total_items) * 100
+
+    def freeze(self):
+        """Copy of the graded progress, taken when a deadline passes."""
+        return self.current_step, list(self.ticks), self.recorded, dict(self.notes), dict(self.ticked_at)
+
+    def restore(self, frozen):
+        self.current_step, self.ticks, self.recorded, self.notes, self.ticked_at = frozen
+
+    def details(self, content):
+        """Per-step results in plain form, for the practice history."""
+        results = []
+        for index in self.recorded_steps():
+            step = content.steps[index]
+            mask = self.ticks[index]
+            times = self.ticked_at.get(index, ())
+            results.append({
+                "step_name": step.name,
+                "completed_items": [item for i, item in enumerate(step.checklist) if mask >> i & 1],
+                "ticked_at": {
+                    item: times[i] for i, item in enumerate(step.checklist)
+                    if mask >> i & 1 and i < len(times) and times[i]
+                },
+                "total_items": len(step.checklist),
+                "notes": self.notes.get(index, ""),
+            })
+        return results
@@ -1,2 +1,20 @@
 # Makes the cardio module a package
-# Import statements will be added as you implement these stations
+# Register the cardiorespiratory stations; add an entry_point once implemented
+from stations.registry import register_station
+
+register_station(
+    "cardio-cardiovascular",
+    title="Cardio Station 1: Cardiovascular Examination",
+    category="Cardiorespiratory",
+    description="Perform a systematic cardiovascular examination.",
+    difficulty="Challenging",
+    time_limit=8,
+)
+register_station(
+    "cardio-respiratory",
+    title="Cardio Station 2: Respiratory Examination",
+    category="Cardiorespiratory",
+    description="Complete a thorough respiratory system examination.",
+    difficulty="Moderate",
+    time_limit=8,
+)
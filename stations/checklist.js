@@ -0,0 +1,61 @@
+// Checklist kept in the browser. Ticks are sent to the server as one batch
+// after a pause in ticking, or as soon as the student presses a button
+// elsewhere on the page (e.g. Next Step), instead of one rerun per tick.
+
+// Unsent ticks per component, kept if the component is re-mounted with stale data
+const pending = new Map();
+
+export default function (component) {
+  const { data, key, parentElement, setStateValue } = component;
+
+  let state = pending.get(key);
+  if (!state || !state.dirty) {
+    state = {
+      checked: [...data.checked],
+      ticked_at: [...data.ticked_at],
+      dirty: false,
+      timer: null,
+    };
+    pending.set(key, state);
+  }
+
+  const flush = () => {
+    clearTimeout(state.timer);
+    state.timer = null;
+    if (!state.dirty) return;
+    state.dirty = false;
+    setStateValue("ticks", { checked: state.checked, ticked_at: state.ticked_at });
+  };
+
+  const root = parentElement.querySelector(".osce-checklist");
+  root.replaceChildren();
+  root.style.gridTemplateColumns = `repeat(${data.columns}, 1fr)`;
+  data.items.forEach((item, i) => {
+    const label = document.createElement("label");
+    const box = document.createElement("input");
+    box.type = "checkbox";
+    box.checked = state.checked[i];
+    box.onchange = () => {
+      state.checked[i] = box.checked;
+      state.ticked_at[i] = box.checked ? Date.now() / 1000 : null;
+      state.dirty = true;
+      clearTimeout(state.timer);
+      state.timer = setTimeout(flush, data.debounce_ms);
+    };
+    label.append(box, document.createTextNode(item));
+    root.append(label);
+  });
+
+  // Send unsent ticks before another button's rerun reads them
+  const onPress = (event) => {
+    if (event.type === "keydown" && event.key !== "Enter" && event.key !== " ") return;
+    if (event.target.closest && event.target.closest("button")) flush();
+  };
+  document.addEventListener("pointerdown", onPress, true);
+  document.addEventListener("keydown", onPress, true);
+
+  return () => {
+    document.removeEventListener("pointerdown", onPress, true);
+    document.removeEventListener("keydown", onPress, true);
+  };
+}
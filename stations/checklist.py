@@ -0,0 +1,49 @@
+import os
+
+from stations.components import register
+
+# Browser side of the checklist, see checklist.js
+CHECKLIST_JS = os.path.join(os.path.dirname(__file__), "checklist.js")
+CHECKLIST_HTML = '<div class="osce-checklist"></div>'
+CHECKLIST_CSS = """
+.osce-checklist { display: grid; gap: 0.5rem 1rem; font-family: var(--st-font); color: var(--st-text-color); }
+.osce-checklist label { display: flex; gap: 0.5rem; align-items: flex-start; cursor: pointer; }
+.osce-checklist input { accent-color: var(--st-primary-color); margin-top: 0.2rem; }
+"""
+
+# Milliseconds without a tick before the batch is sent
+DEBOUNCE_MS = 1500
+
+
+def _get_component():
+    return register("osce_checklist", CHECKLIST_JS, CHECKLIST_HTML, CHECKLIST_CSS)
+
+
+def _empty_ticks(count):
+    return {"checked": [False] * count, "ticked_at": [None] * count}
+
+
+def client_checklist(items, key, columns=1, ticks=None):
+    """Checklist whose ticks stay in the browser until sent as one batch.
+
+    ticks is the value returned on the previous rerun, if any. Returns
+    {"checked": [...], "ticked_at": [...]}, one entry per item, with the
+    epoch time each item was ticked (None if unticked).
+    """
+    ticks = ticks or _empty_ticks(len(items))
+    result = _get_component()(
+        key=key,
+        data={
+            "items": list(items),
+            "columns": columns,
+            "debounce_ms": DEBOUNCE_MS,
+            "checked": ticks["checked"],
+            "ticked_at": ticks["ticked_at"],
+        },
+        on_ticks_change=lambda: None,
+    )
+
+    sent = result.get("ticks")
+    if sent and len(sent.get("checked", ())) == len(items):
+        ticks = {"checked": list(sent["checked"]), "ticked_at": list(sent["ticked_at"])}
+    return ticks
@@ -0,0 +1,25 @@
+try:
+    from streamlit.components import v2 as components_v2
+except ImportError:  # Streamlit without custom component v2 support
+    components_v2 = None
+
+# JS source per file, read once per process
+_js = {}
+
+
+def is_supported():
+    """True if this Streamlit has custom components v2 (browser-side widgets)."""
+    return components_v2 is not None
+
+
+def register(name, js_path, html, css):
+    """Return the component called name, registered for the current runtime.
+
+    Registering is cheap and idempotent, and each Streamlit runtime keeps its
+    own registry, so callers register on every mount.
+    """
+    js = _js.get(js_path)
+    if js is None:
+        with open(js_path, encoding="utf-8") as f:
+            js = _js[js_path] = f.read()
+    return components_v2.component(name, html=html, css=css, js=js)
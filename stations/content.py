@@ -0,0 +1,133 @@
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+# Compiled, read-only station content shared by every session
+Step = namedtuple("Step", ["name", "content", "checklist"])
+StationContent = namedtuple(
+    "StationContent",
+    ["id", "title", "time_limit", "blocks", "tabs", "steps", "runner", "total_items", "digest"],
+)
+Tab = namedtuple("Tab", ["label", "content"])
+Runner = namedtuple("Runner", ["layout", "timer", "history_name", "completion_message"])
+
+# Accepted values for the [runner] table
+LAYOUTS = ("stacked", "side")
+TIMERS = ("countdown", "stopwatch")
+
+
+class Markdown(str):
+    """A markdown string carrying its SHA-256 digest, taken once at compile time."""
+
+
+def _markdown(text):
+    block = Markdown(text)
+    block.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return block
+
+
+class StationContentError(ValueError):
+    """Raised when a station content file is missing fields or malformed."""
+
+
+_compiled = {}      # content digest -> StationContent
+_file_digests = {}  # path -> (mtime, size, digest)
+_lock = threading.Lock()
+
+
+def _require(mapping, key, kind, where):
+    value = mapping.get(key)
+    if not isinstance(value, kind):
+        raise StationContentError(f"{where}: '{key}' must be a {kind.__name__}")
+    return value
+
+
+def compile_station(raw, digest, source="station content"):
+    """Validate parsed content and freeze it into a StationContent."""
+    station_id = _require(raw, "id", str, source)
+    title = _require(raw, "title", str, source)
+    time_limit = _require(raw, "time_limit", int, source)
+
+    blocks = raw.get("blocks", {})
+    if not all(isinstance(v, str) for v in blocks.values()):
+        raise StationContentError(f"{source}: every entry in [blocks] must be a string")
+
+    tabs = []
+    for i, tab in enumerate(raw.get("tabs", [])):
+        where = f"{source} tab {i + 1}"
+        tabs.append(Tab(_require(tab, "label", str, where), _markdown(_require(tab, "content", str, where))))
+
+    steps = []
+    names = set()
+    for i, step in enumerate(_require(raw, "steps", list, source)):
+        where = f"{source} step {i + 1}"
+        name = _require(step, "name", str, where)
+        if name in names:
+            raise StationContentError(f"{where}: duplicate step name '{name}'")
+        names.add(name)
+        checklist = _require(step, "checklist", list, where)
+        if not checklist or not all(isinstance(item, str) for item in checklist):
+            raise StationContentError(f"{where}: 'checklist' must be a non-empty list of strings")
+        steps.append(Step(name, _markdown(_require(step, "content", str, where)), tuple(checklist)))
+    if not steps:
+        raise StationContentError(f"{source}: a station needs at least one step")
+
+    runner = raw.get("runner", {})
+    layout = runner.get("layout", "stacked")
+    timer = runner.get("timer", "countdown")
+    if layout not in LAYOUTS:
+        raise StationContentError(f"{source}: runner layout must be one of {', '.join(LAYOUTS)}")
+    if timer not in TIMERS:
+        raise StationContentError(f"{source}: runner timer must be one of {', '.join(TIMERS)}")
+    runner = Runner(
+        layout=layout,
+        timer=timer,
+        history_name=runner.get("history_name", title),
+        completion_message=runner.get("completion_message", "You have completed all steps of the station!"),
+    )
+
+    return StationContent(
+        id=station_id,
+        title=title,
+        time_limit=time_limit,
+        blocks=MappingProxyType({key: _markdown(text) for key, text in blocks.items()}),
+        tabs=tuple(tabs),
+        steps=tuple(steps),
+        runner=runner,
+        total_items=sum(len(step.checklist) for step in steps),
+        digest=digest,
+    )
+
+
+def load_station_content(path):
+    """Return the compiled content of a station file.
+
+    The file is only re-read when its mtime or size changes, and only
+    recompiled when its SHA-256 digest is new, so reruns are a dict lookup.
+    """
+    stat = os.stat(path)
+    cached = _file_digests.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return _compiled[cached[2]]
+
+    with _lock:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        content = _compiled.get(digest)
+        if content is None:
+            try:
+                raw = tomllib.loads(data.decode("utf-8"))
+            except Exception as e:
+                raise StationContentError(f"{path}: {e}") from e
+            content = compile_station(raw, digest, source=os.path.basename(path))
+            _compiled[digest] = content
+        _file_digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return content
@@ -0,0 +1,111 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from ui.session import peek
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineScheduler:
+    """Station time limits for every session, enforced by one background thread.
+
+    Deadlines sit in a min-heap, so scheduling is O(log n) and the thread
+    sleeps until the earliest one is due. Only ids are kept: when an attempt's
+    deadline passes, locate(owner) finds the owner's current attempt and the
+    scheduler freezes a copy of its progress for grading. The session picks
+    up the expiry the next time it reruns, even if the tab sat idle.
+    """
+
+    def __init__(self, locate=None, expired_limit=10000):
+        self.locate = locate
+        self.expired_limit = expired_limit
+        self._heap = []  # (deadline, seq, attempt_id)
+        self._active = {}  # attempt_id -> (deadline, owner)
+        self._expired = OrderedDict()  # attempt_id -> frozen record
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._work, name="station-deadlines", daemon=True)
+        self._thread.start()
+
+    def schedule(self, attempt_id, deadline, owner):
+        """Expire an attempt at deadline (epoch seconds), freezing its progress.
+
+        owner is whatever locate() needs to find the attempt later, e.g.
+        (session id, station id).
+        """
+        with self._cond:
+            self._active[attempt_id] = (deadline, owner)
+            heapq.heappush(self._heap, (deadline, next(self._seq), attempt_id))
+            # Wake the thread only if this is now the earliest deadline
+            if self._heap[0][2] == attempt_id:
+                self._cond.notify()
+
+    def cancel(self, attempt_id):
+        """Forget an attempt that finished or was reset before its deadline.
+
+        Its heap entry is skipped when it comes up.
+        """
+        with self._cond:
+            self._active.pop(attempt_id, None)
+            self._expired.pop(attempt_id, None)
+
+    def poll(self, attempt_id):
+        """Return the frozen record once if the attempt has expired, else None."""
+        with self._cond:
+            return self._expired.pop(attempt_id, None)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "scheduled": len(self._active),
+                "expired_unseen": len(self._expired),
+                "heap_entries": len(self._heap),
+            }
+
+    def _work(self):
+        with self._cond:
+            while True:
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    deadline, _, attempt_id = heapq.heappop(self._heap)
+                    entry = self._active.get(attempt_id)
+                    if entry is None or entry[0] != deadline:
+                        continue  # Cancelled or rescheduled
+                    del self._active[attempt_id]
+                    # One bad expiry must not stop every other deadline
+                    try:
+                        self._expire(attempt_id, deadline, entry[1])
+                    except Exception:
+                        logger.exception("Failed to expire station attempt %s", attempt_id)
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._cond.wait(timeout)
+
+    def _expire(self, attempt_id, deadline, owner):
+        # A session that is gone or spilled to disk has been idle, so there is
+        # no later progress to exclude: frozen stays None and the attempt is
+        # graded as it is
+        attempt = self.locate(owner) if self.locate is not None else None
+        frozen = None
+        if attempt is not None and attempt.attempt_id == attempt_id:
+            frozen = attempt.freeze()
+        self._expired[attempt_id] = {"expired_at": deadline, "frozen": frozen}
+        # Forget the oldest unseen expiries so the table stays bounded
+        while len(self._expired) > self.expired_limit:
+            self._expired.popitem(last=False)
+
+
+def _locate_attempt(owner):
+    session_id, station_id = owner
+    return peek(session_id, station_id, "attempt")
+
+
+@st.cache_resource
+def get_deadline_scheduler():
+    """Return the process-wide station deadline scheduler."""
+    return DeadlineScheduler(locate=_locate_attempt)
@@ -1,4 +1,26 @@
 # Makes the msk module a package
-# Import station display functions
-from stations.msk.shoulder import display_station as display_shoulder_station
-from stations.msk.knee import display_station as display_knee_station
+# Register the musculoskeletal stations; modules are imported when selected
+import os
+
+from stations.registry import register_station
+
+HERE = os.path.dirname(__file__)
+
+register_station(
+    "msk-shoulder",
+    title="MSK Station 1: Shoulder Examination",
+    category="Musculoskeletal",
+    description="Practice a focused examination of the shoulder joint.",
+    difficulty="Moderate",
+    entry_point="stations.msk.shoulder:display_station",
+    content=os.path.join(HERE, "shoulder.toml"),
+)
+register_station(
+    "msk-knee",
+    title="MSK Station 2: Knee Examination",
+    category="Musculoskeletal",
+    description="Conduct a comprehensive assessment of the knee joint.",
+    difficulty="Moderate",
+    entry_point="stations.msk.knee:display_station",
+    content=os.path.join(HERE, "knee.toml"),
+)
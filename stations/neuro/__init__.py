@@ -1,2 +1,20 @@
 # Makes the neuro module a package
-# Import statements will be added as you implement these stations
+# Register the neurology stations; add an entry_point once implemented
+from stations.registry import register_station
+
+register_station(
+    "neuro-cranial-nerves",
+    title="Neuro Station 1: Cranial Nerve Examination",
+    category="Neurology",
+    description="Assess the 12 cranial nerves systematically.",
+    difficulty="Challenging",
+    time_limit=10,
+)
+register_station(
+    "neuro-upper-limb",
+    title="Neuro Station 2: Upper Limb Neurological Examination",
+    category="Neurology",
+    description="Perform a focused neurological examination of the upper limb.",
+    difficulty="Moderate",
+    time_limit=8,
+)
@@ -1 +1,20 @@
+# Makes the others module a package
+# Register the specialty stations; add an entry_point once implemented
+from stations.registry import register_station
 
+register_station(
+    "geriatric-assessment",
+    title="Geriatric Station: Comprehensive Geriatric Assessment",
+    category="Specialty",
+    description="Perform key elements of a geriatric assessment.",
+    difficulty="Moderate",
+    time_limit=10,
+)
+register_station(
+    "paediatric-development",
+    title="Paediatric Station: Developmental Assessment",
+    category="Specialty",
+    description="Conduct age-appropriate developmental screening.",
+    difficulty="Challenging",
+    time_limit=8,
+)
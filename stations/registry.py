@@ -0,0 +1,135 @@
+import importlib
+import threading
+import time
+from collections import namedtuple
+
+from stations.content import load_station_content
+
+# One practice station. entry_point is "module:function" for implemented
+# stations and None for ones still under development. Stations with a content
+# file take their time limit from it, so time_limit is only set for the rest.
+Station = namedtuple(
+    "Station",
+    ["id", "title", "category", "description", "difficulty", "time_limit", "entry_point", "content"],
+)
+
+# Category packages whose __init__ registers their stations, in display order
+CATEGORY_PACKAGES = [
+    "stations.msk",
+    "stations.cardio",
+    "stations.neuro",
+    "stations.others",
+]
+
+_stations = {}
+_categories = {}
+
+# Process-wide cache of imported entry points, shared by every session.
+# Failures are remembered too, so a broken module is only tried once.
+_entry_points = {}
+_import_errors = {}
+_import_times = {}
+_import_lock = threading.Lock()
+
+
+def register_station(station_id, title, category, description, difficulty,
+                     time_limit=None, entry_point=None, content=None):
+    """Add a station to the catalog.
+
+    content is the path of the station's data file, which then supplies the
+    time limit; stations without one give time_limit in minutes.
+
+    Registering an identical station again is a no-op, so a category package
+    can be re-imported (e.g. by Streamlit's file watcher). Reusing an id for a
+    different station is an error.
+    """
+    if (time_limit is None) == (content is None):
+        raise ValueError(f"Station '{station_id}' needs either a time_limit or a content file")
+    station = Station(station_id, title, category, description, difficulty, time_limit, entry_point, content)
+    existing = _stations.get(station_id)
+    if existing is not None:
+        if existing == station:
+            return existing
+        raise ValueError(f"Station '{station_id}' is already registered as {existing.title!r}")
+    _stations[station_id] = station
+    _categories.setdefault(category, []).append(station)
+    return station
+
+
+def get_station(station_id):
+    """Look a station up by id, or None if it isn't registered."""
+    return _stations.get(station_id)
+
+
+def station_time_limit(station):
+    """Time limit in minutes, read from the content file when there is one."""
+    if station.content is not None:
+        return load_station_content(station.content).time_limit
+    return station.time_limit
+
+
+def stations_by_category():
+    """Registered stations grouped by category, in registration order."""
+    return _categories
+
+
+def load_entry_point(station):
+    """Return the station's display function, importing its module on first use.
+
+    Returns None for stations without an entry point or whose module failed
+    to import; see import_error() for the reason.
+    """
+    entry_point = station.entry_point
+    if entry_point is None:
+        return None
+    function = _entry_points.get(entry_point)
+    if function is not None or entry_point in _import_errors:
+        return function
+
+    with _import_lock:
+        if entry_point in _entry_points or entry_point in _import_errors:
+            return _entry_points.get(entry_point)
+        module_name, function_name = entry_point.split(":")
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(module_name)
+            function = getattr(module, function_name)
+        except Exception as e:
+            _import_errors[entry_point] = f"{type(e).__name__}: {e}"
+            return None
+        finally:
+            _import_times[module_name] = time.perf_counter() - started
+        _entry_points[entry_point] = function
+        return function
+
+
+def import_error(station):
+    """Why the station's module couldn't be imported, or None."""
+    return _import_errors.get(station.entry_point)
+
+
+def is_available(station):
+    """True if the station can be started (without importing it)."""
+    return station.entry_point is not None and station.entry_point not in _import_errors
+
+
+def import_stats():
+    """Seconds spent importing each station module, and any import errors."""
+    return {
+        module_name: {
+            "seconds": seconds,
+            "error": next(
+                (error for entry_point, error in _import_errors.items()
+                 if entry_point.split(":")[0] == module_name),
+                None,
+            ),
+        }
+        for module_name, seconds in _import_times.items()
+    }
+
+
+def load_catalog():
+    """Import every category package so its stations are registered."""
+    for package in CATEGORY_PACKAGES:
+        importlib.import_module(package)
+    return _categories
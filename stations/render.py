@@ -0,0 +1,74 @@
+import hashlib
+import threading
+
+import streamlit as st
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:  # Fall back to Streamlit's own markdown rendering
+    MarkdownIt = None
+
+# CommonMark plus tables and strikethrough, close to what st.markdown supports
+_parser = None if MarkdownIt is None else (
+    MarkdownIt("commonmark", {"html": True}).enable("table").enable("strikethrough")
+)
+
+# Rendered HTML keyed by content digest. Station content is a fixed set of
+# blocks, so the cache only grows with the catalog, not with traffic.
+_cache = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def render_html(text):
+    """Markdown block to final HTML, rendered once per content.
+
+    Compiled station content carries its digest (see stations.content.Markdown);
+    other strings are hashed here.
+    """
+    key = getattr(text, "digest", None) or hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _lock:
+        html = _cache.get(key)
+        if html is not None:
+            _stats["hits"] += 1
+            return html
+        _stats["misses"] += 1
+    html = f'<div class="osce-md">{_parser.render(text)}</div>'
+    with _lock:
+        _cache[key] = html
+    return html
+
+
+def render_markdown(text):
+    """Emit a static content block as cached HTML instead of raw markdown."""
+    if _parser is None:
+        st.markdown(text, unsafe_allow_html=True)
+        return
+    st.html(render_html(text))
+
+
+def lazy_tabs(labels, key, render_tab):
+    """Tabs that only build and send the selected tab's content.
+
+    render_tab(index) is called inside the open tab. Switching tabs reruns
+    the page to fill in the newly selected one.
+    """
+    try:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:  # Older Streamlit without tab state: render every tab
+        tabs = st.tabs(labels)
+        for index, tab in enumerate(tabs):
+            with tab:
+                render_tab(index)
+        return
+
+    for index, tab in enumerate(tabs):
+        if tab.open:
+            with tab:
+                render_tab(index)
+
+
+def render_stats():
+    """Cache hit/miss counts and the number of rendered blocks."""
+    with _lock:
+        return dict(_stats, entries=len(_cache))
@@ -0,0 +1,387 @@
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+from stations.attempt import Attempt
+from stations.checklist import client_checklist
+from stations.components import is_supported as components_supported
+from stations.deadlines import get_deadline_scheduler
+from stations.render import render_markdown
+from stations.timer import client_timer
+from ui.session import namespace, session_root
+
+# Checklist and notes rerun on their own as fragments; set to 0 to rerun the
+# whole station on every click (used for before/after timings)
+FRAGMENTS = os.environ.get("OSCE_STATION_FRAGMENTS", "1") != "0"
+# Keep checklist ticks in the browser and send them in batches; set to 0 for
+# plain checkboxes
+CLIENT_CHECKLIST = (
+    os.environ.get("OSCE_CLIENT_CHECKLIST", "1") != "0" and components_supported()
+)
+# Tick timers in the browser instead of only on reruns; set to 0 for the
+# server-drawn timer
+CLIENT_TIMER = os.environ.get("OSCE_CLIENT_TIMER", "1") != "0" and components_supported()
+# Mock exams end every station at its time limit, not just countdown stations
+MOCK_EXAM = os.environ.get("OSCE_MOCK_EXAM", "0") == "1"
+TIMING_SAMPLES = 500
+
+# Recent script times per scope ("station", "checklist", "notes"), process-wide
+_timings_lock = threading.Lock()
+_timings = {}
+
+
+def _fragment(function):
+    return st.fragment(function) if FRAGMENTS else function
+
+
+@contextmanager
+def _timed(scope):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _timings_lock:
+            _timings.setdefault(scope, deque(maxlen=TIMING_SAMPLES)).append(elapsed)
+
+
+def runner_stats():
+    """Recent script time per scope, in milliseconds."""
+    with _timings_lock:
+        samples = {scope: sorted(times) for scope, times in _timings.items()}
+    return {
+        scope: {
+            "runs": len(times),
+            "mean_ms": sum(times) / len(times) * 1000,
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        }
+        for scope, times in samples.items()
+    }
+
+
+def get_attempt(content):
+    """This session's attempt at a station, created on first use."""
+    ns = namespace(content.id)
+    if "attempt" not in ns:
+        ns["attempt"] = Attempt(content)
+    return ns["attempt"]
+
+
+def reset_station(content):
+    """Forget this session's progress and widget values for a station."""
+    ns = namespace(content.id)
+    attempt = ns.get("attempt")
+    if attempt is not None and attempt.attempt_id:
+        get_deadline_scheduler().cancel(attempt.attempt_id)
+    ns.clear()
+
+
+def format_time(seconds):
+    mins, secs = divmod(int(seconds), 60)
+    return f"{mins:02d}:{secs:02d}"
+
+
+def score(content, attempt):
+    """Return (completed items, total items, percentage)."""
+    return attempt.score(content)
+
+
+def run_station(content, actions=()):
+    """Run a compiled station: start screen, timer, the active step, then the summary.
+
+    actions is a list of (label, callback) pairs shown as buttons under the
+    summary; each callback runs before the page reruns.
+    """
+    with _timed("station"):
+        _run_station(content, actions)
+
+
+def _has_deadline(content):
+    return content.runner.timer == "countdown" or MOCK_EXAM
+
+
+def _finish(content, attempt, timed_out=False):
+    attempt.finished_at = time.time()
+    if timed_out:
+        attempt.timed_out = True
+        attempt.current_step = len(content.steps)
+    if attempt.attempt_id:
+        get_deadline_scheduler().cancel(attempt.attempt_id)
+
+
+def _apply_expiry(content, attempt):
+    """Close the attempt if the deadline scheduler expired it since the last rerun."""
+    if not attempt.attempt_id or attempt.finished_at is not None:
+        return
+    record = get_deadline_scheduler().poll(attempt.attempt_id)
+    if record is None:
+        return
+    # Grade what was done by the deadline, not anything after it
+    if record["frozen"] is not None:
+        attempt.restore(record["frozen"])
+    attempt.timed_out = True
+    attempt.finished_at = record["expired_at"]
+    attempt.current_step = len(content.steps)
+
+
+def _run_station(content, actions):
+    attempt = get_attempt(content)
+
+    if attempt.started_at is None:
+        _render_start(content, attempt)
+        return
+
+    _apply_expiry(content, attempt)
+
+    _render_timer(content, attempt)
+
+    if attempt.current_step < len(content.steps):
+        _render_step(content, attempt)
+    else:
+        _render_summary(content, attempt, actions)
+
+
+def _render_start(content, attempt):
+    def start():
+        attempt.started_at = time.time()
+        if _has_deadline(content):
+            attempt.attempt_id = uuid.uuid4().hex
+            get_deadline_scheduler().schedule(
+                attempt.attempt_id, attempt.started_at + content.time_limit * 60,
+                (session_root().session_id, content.id),
+            )
+        st.rerun()
+
+    if content.runner.layout == "side":
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            if "practice_instructions" in content.blocks:
+                st.info(content.blocks["practice_instructions"])
+        with col2:
+            if st.button("Start Station"):
+                start()
+    elif st.button("Start Station"):
+        start()
+
+
+def _render_timer(content, attempt):
+    limit = content.time_limit * 60
+    end = attempt.finished_at or time.time()
+    elapsed = end - attempt.started_at
+
+    if content.runner.timer == "countdown":
+        remaining = max(0, limit - elapsed)
+        expired = False
+        if CLIENT_TIMER:
+            expired = client_timer(
+                namespace(content.id).key("timer"), "Time Remaining", attempt.started_at,
+                mode="countdown", limit=limit, stopped_at=attempt.finished_at,
+            )
+        else:
+            st.markdown(f"""
+            <div class="osce-timer-box">
+                <h2>Time Remaining: {format_time(remaining)}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # End the station if time runs out (the browser timer reports it once)
+        if (remaining <= 0 or expired) and attempt.finished_at is None:
+            _finish(content, attempt, timed_out=True)
+            st.rerun()
+    else:
+        if CLIENT_TIMER:
+            client_timer(
+                namespace(content.id).key("timer"), "Time Elapsed", attempt.started_at,
+                limit=limit, stopped_at=attempt.finished_at,
+                note=f"Target: {content.time_limit} minutes",
+            )
+        else:
+            st.markdown(f"""
+            <div class="osce-timer-box osce-stopwatch">
+                <h2>Time Elapsed: {format_time(elapsed)}</h2>
+                <p>Target: {content.time_limit} minutes</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # Warning if over time
+        if elapsed > limit and attempt.finished_at is None:
+            st.warning(f"You've exceeded the {content.time_limit}-minute target time. "
+                       "In a real OSCE, you would need to conclude now.")
+
+
+def _check_key(step_index, item_index):
+    return f"check_{step_index}_{item_index}"
+
+
+def _step_ticks(content, step_index):
+    """Ticked flags and tick times for a step, from the client checklist or the checkboxes."""
+    step = content.steps[step_index]
+    ns = namespace(content.id)
+    ticks = ns.get(f"ticks_{step_index}")
+    if ticks is not None:
+        return ticks["checked"], ticks["ticked_at"]
+    checked = [
+        ns.widget_value(_check_key(step_index, i), False)
+        for i in range(len(step.checklist))
+    ]
+    return checked, [None] * len(checked)
+
+
+@_fragment
+def _render_checklist(content, current_step, columns, saved=0):
+    """Checklist for the active step, spread across columns.
+
+    Runs as a fragment, so a tick reruns only the checklist. The client
+    checklist goes further and sends ticks in batches. saved is the step's
+    recorded bitmask, used to restore ticks when a student comes back to it.
+    """
+    with _timed("checklist"):
+        step = content.steps[current_step]
+        ns = namespace(content.id)
+        if CLIENT_CHECKLIST:
+            ns[f"ticks_{current_step}"] = client_checklist(
+                step.checklist, ns.key(f"checklist_{current_step}"), columns,
+                ticks=ns.get(f"ticks_{current_step}"),
+            )
+            return
+        containers = st.columns(columns) if columns > 1 else [st.container()]
+        for i, item in enumerate(step.checklist):
+            with containers[i % len(containers)]:
+                st.checkbox(item, key=ns.key(_check_key(current_step, i)), value=bool(saved >> i & 1))
+
+
+@_fragment
+def _render_notes(content, current_step, saved=""):
+    with _timed("notes"):
+        st.text_area("Your notes for this step:", value=saved,
+                     key=namespace(content.id).key(f"notes_{current_step}"), height=100)
+
+
+def _render_step(content, attempt):
+    current_step = attempt.current_step
+    step = content.steps[current_step]
+
+    if content.runner.layout == "side":
+        # Content on the left, checklist on the right
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            render_markdown(step.content)
+        with col2:
+            st.markdown("""
+            <div class="osce-checklist-header">
+            <h3>Checklist</h3>
+            </div>
+            """, unsafe_allow_html=True)
+            _render_checklist(content, current_step, 1, attempt.ticks[current_step])
+    else:
+        render_markdown(step.content)
+        st.subheader("Checklist")
+        _render_checklist(content, current_step, 2, attempt.ticks[current_step])
+
+    # Notes section
+    _render_notes(content, current_step, attempt.notes.get(current_step, ""))
+
+    # Navigation buttons
+    cols = st.columns(2)
+
+    with cols[0]:
+        if current_step > 0:
+            if st.button("Previous Step"):
+                attempt.current_step -= 1
+                st.rerun()
+
+    with cols[1]:
+        if st.button("Next Step"):
+            # Save completed checklist items, with when each was ticked
+            checked, ticked_at = _step_ticks(content, current_step)
+            attempt.record_step(
+                current_step, checked,
+                notes=namespace(content.id).widget_value(f"notes_{current_step}", ""),
+                ticked_at=ticked_at,
+            )
+            attempt.current_step += 1
+            if attempt.current_step == len(content.steps):
+                _finish(content, attempt)
+            st.rerun()
+
+
+def _render_summary(content, attempt, actions):
+    time_taken = format_time(attempt.finished_at - attempt.started_at)
+
+    if attempt.timed_out:
+        st.warning("Time's up! Here is how far you got.")
+    else:
+        st.success(content.runner.completion_message)
+
+    completed_items, total_items, score_percentage = score(content, attempt)
+    styled = content.runner.layout == "side"
+
+    # Display score with time taken
+    if styled:
+        st.markdown(f"""
+        <div class="osce-summary-card">
+            <h2>Station Summary</h2>
+            <p><strong>Time taken:</strong> {time_taken} (Target: {content.time_limit} minutes)</p>
+            <p><strong>Score:</strong> {completed_items}/{total_items} ({score_percentage:.1f}%)</p>
+        </div>
+        """, unsafe_allow_html=True)
+        st.markdown("### Performance by section:")
+    else:
+        st.markdown(f"""
+        ## Station Summary
+        
+        **Score:** {completed_items}/{total_items} ({score_percentage:.1f}%)
+        
+        **Performance by section:**
+        """)
+
+    # Display performance by section
+    for index in attempt.recorded_steps():
+        step_name = content.steps[index].name
+        done, total = attempt.step_score(content, index)
+        step_score = (done / total) * 100
+        if styled:
+            st.markdown(f"""
+            <div class="osce-section-score">
+            <strong>{step_name}:</strong> {done}/{total} ({step_score:.1f}%)
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"**{step_name}:** {done}/{total} ({step_score:.1f}%)")
+
+        if index in attempt.notes:
+            st.markdown(f"**Your notes:** {attempt.notes[index]}")
+
+    if "model_answer" in content.blocks:
+        render_markdown(content.blocks["model_answer"])
+
+    # Save results button
+    if st.button("Save Results"):
+        # Save to session state for now
+        if "practice_history" not in st.session_state:
+            st.session_state.practice_history = []
+
+        st.session_state.practice_history.append({
+            "station": content.runner.history_name,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "time_taken": time_taken,
+            "score": f"{score_percentage:.1f}%",
+            "details": attempt.details(content),
+        })
+
+        st.success("Results saved successfully!")
+
+    # Return buttons
+    if actions:
+        cols = st.columns(len(actions))
+        for col, (label, callback) in zip(cols, actions):
+            with col:
+                if st.button(label):
+                    callback()
+                    st.rerun()
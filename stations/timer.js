@@ -0,0 +1,55 @@
+// Countdown or stopwatch that ticks in the browser. The server sends the
+// start time (and for countdowns the deadline), which never change for a
+// timer; the only message back is a single "expired" trigger when a
+// countdown reaches zero.
+
+// Countdowns already reported, so a re-mount doesn't report again
+const reported = new Set();
+
+// Clock correction per timer, fixed the first time it mounts
+const offsets = new Map();
+
+function formatTime(seconds) {
+  const whole = Math.max(0, Math.floor(seconds));
+  const mins = String(Math.floor(whole / 60)).padStart(2, "0");
+  const secs = String(whole % 60).padStart(2, "0");
+  return `${mins}:${secs}`;
+}
+
+export default function (component) {
+  const { data, key, parentElement, setTriggerValue } = component;
+  const root = parentElement.querySelector(".osce-timer");
+  root.classList.toggle("osce-timer-boxed", data.boxed);
+  root.classList.toggle("osce-timer-countdown", data.mode === "countdown");
+  root.querySelector(".osce-timer-note").textContent = data.note || "";
+  const time = root.querySelector(".osce-timer-time");
+
+  // A browser clock running behind the server would show a start time in
+  // the future; never count from before zero. Deadlines are enforced on the
+  // server, so skew only affects what is shown.
+  const reportKey = `${key}:${data.started_at}`;
+  if (!offsets.has(reportKey)) {
+    offsets.set(reportKey, Math.max(0, data.started_at - Date.now() / 1000));
+  }
+  const offset = offsets.get(reportKey);
+
+  const tick = () => {
+    const now = data.stopped_at ?? Date.now() / 1000 + offset;
+    const elapsed = now - data.started_at;
+    let shown = elapsed;
+    if (data.mode === "countdown") {
+      shown = data.deadline - now;
+      if (shown <= 0 && data.stopped_at == null && !reported.has(reportKey)) {
+        reported.add(reportKey);
+        setTriggerValue("expired", true);
+      }
+    }
+    root.classList.toggle("osce-timer-over", data.deadline != null && now > data.deadline);
+    time.textContent = `${data.label}: ${formatTime(shown)}`;
+  };
+
+  tick();
+  if (data.stopped_at != null) return undefined;
+  const interval = setInterval(tick, 1000);
+  return () => clearInterval(interval);
+}
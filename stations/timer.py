@@ -0,0 +1,49 @@
+import os
+
+from stations.components import register
+
+# Browser side of the timer, see timer.js
+TIMER_JS = os.path.join(os.path.dirname(__file__), "timer.js")
+TIMER_HTML = """
+<div class="osce-timer">
+    <h2 class="osce-timer-time"></h2>
+    <p class="osce-timer-note"></p>
+</div>
+"""
+TIMER_CSS = """
+.osce-timer { text-align: center; font-family: var(--st-font); color: var(--st-text-color); }
+.osce-timer h2 { margin: 0.5rem 0; font-weight: 600; }
+.osce-timer p:empty { display: none; }
+.osce-timer-boxed { background-color: #f5f5f5; padding: 10px; border-radius: 5px; border: 2px solid #4CAF50; color: #31333F; }
+.osce-timer-boxed.osce-timer-countdown { background-color: #f0f0f0; border-color: transparent; }
+.osce-timer-boxed.osce-timer-over { border-color: #ff9800; }
+"""
+
+
+def _get_component():
+    return register("osce_timer", TIMER_JS, TIMER_HTML, TIMER_CSS)
+
+
+def client_timer(key, label, started_at, mode="stopwatch", limit=None,
+                 stopped_at=None, note=None, boxed=True):
+    """Countdown or stopwatch that ticks in the browser without reruns.
+
+    started_at and stopped_at are epoch times from the server; limit is in
+    seconds. Only fixed values are sent, so reruns don't resend the payload.
+    Returns True on the one rerun in which a countdown reports that it
+    reached zero.
+    """
+    result = _get_component()(
+        key=key,
+        data={
+            "label": label,
+            "mode": mode,
+            "started_at": started_at,
+            "deadline": started_at + limit if limit is not None else None,
+            "stopped_at": stopped_at,
+            "note": note,
+            "boxed": boxed,
+        },
+        on_expired_change=lambda: None,
+    )
+    return bool(result.get("expired"))
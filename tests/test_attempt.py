@@ -0,0 +1,66 @@
+from stations.attempt import Attempt
+from stations.content import compile_station
+
+RAW = {
+    "id": "demo",
+    "title": "Demo",
+    "time_limit": 8,
+    "steps": [
+        {"name": "History", "content": "Ask.", "checklist": ["Consent", "Pain", "Onset"]},
+        {"name": "Exam", "content": "Look.", "checklist": ["Inspect", "Palpate"]},
+    ],
+}
+
+
+def make():
+    content = compile_station(RAW, digest="demo")
+    return content, Attempt(content)
+
+
+def test_record_step_keeps_ticks_as_bitmask():
+    content, attempt = make()
+    attempt.record_step(0, [True, False, True], notes="ok")
+    assert attempt.ticks == [0b101, 0]
+    assert attempt.recorded_steps() == [0]
+    assert attempt.step_score(content, 0) == (2, 3)
+
+
+def test_re_recording_overwrites():
+    content, attempt = make()
+    attempt.record_step(0, [True, True, True], notes="first")
+    attempt.record_step(0, [False, True, False])
+    assert attempt.step_score(content, 0) == (1, 3)
+    assert attempt.notes == {}
+
+
+def test_score():
+    content, attempt = make()
+    attempt.record_step(0, [True, True, False])
+    attempt.record_step(1, [True, False])
+    completed, total, percent = attempt.score(content)
+    assert (completed, total) == (3, 5)
+    assert percent == 60
+
+
+def test_freeze_and_restore():
+    content, attempt = make()
+    attempt.record_step(0, [True, False, False], notes="n", ticked_at=[5.0, None, None])
+    frozen = attempt.freeze()
+    attempt.record_step(1, [True, True])
+    attempt.current_step = 2
+    attempt.restore(frozen)
+    assert attempt.recorded_steps() == [0]
+    assert attempt.ticks == [1, 0]
+    assert attempt.current_step == 0
+
+
+def test_details():
+    content, attempt = make()
+    attempt.record_step(1, [False, True], notes="sore", ticked_at=[None, 12.5])
+    assert attempt.details(content) == [{
+        "step_name": "Exam",
+        "completed_items": ["Palpate"],
+        "ticked_at": {"Palpate": 12.5},
+        "total_items": 2,
+        "notes": "sore",
+    }]
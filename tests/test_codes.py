@@ -0,0 +1,69 @@
+import pytest
+
+from auth import codes
+from auth.codes import EXPIRED, INVALID, LOCKED, MISSING, VALID, VerificationCodeStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(codes, "time", clock)
+    return clock
+
+
+def test_valid_code_returns_payload_once(clock):
+    store = VerificationCodeStore()
+    code, _ = store.issue("a@example.com", {"password": "hash"})
+    assert store.verify("a@example.com", code) == (VALID, {"password": "hash"})
+    assert store.verify("a@example.com", code) == (MISSING, None)
+
+
+def test_emails_are_matched_case_insensitively(clock):
+    store = VerificationCodeStore()
+    code, _ = store.issue(" User@Example.com", "payload")
+    assert store.issue("user@example.com") == (None, 60)
+    assert store.retry_after("USER@example.com") == 60
+    assert store.verify("user@EXAMPLE.com", code) == (VALID, "payload")
+
+
+def test_resend_cooldown(clock):
+    store = VerificationCodeStore(resend_cooldown=60)
+    store.issue("a@example.com")
+    clock.now += 30
+    assert store.issue("a@example.com") == (None, 30)
+    clock.now += 30
+    code, retry_after = store.issue("a@example.com")
+    assert code is not None and retry_after == 0
+
+
+def test_code_expires(clock):
+    store = VerificationCodeStore(ttl=600)
+    code, _ = store.issue("a@example.com")
+    clock.now += 600
+    assert store.verify("a@example.com", code) == (EXPIRED, None)
+
+
+def test_locks_after_max_attempts(clock):
+    store = VerificationCodeStore(max_attempts=3)
+    code, _ = store.issue("a@example.com")
+    wrong = "000000" if code != "000000" else "111111"
+    assert store.verify("a@example.com", wrong) == (INVALID, None)
+    assert store.verify("A@example.com", wrong) == (INVALID, None)
+    assert store.verify("a@example.com", wrong) == (LOCKED, None)
+    assert store.verify("a@example.com", code) == (LOCKED, None)
+
+
+def test_oldest_code_evicted_at_capacity(clock):
+    store = VerificationCodeStore(max_entries=2)
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        store.issue(email)
+    assert len(store) == 2
+    assert store.retry_after("a@example.com") == 0
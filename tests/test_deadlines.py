@@ -0,0 +1,72 @@
+import time
+
+from stations.deadlines import DeadlineScheduler
+
+
+class FakeAttempt:
+    def __init__(self, attempt_id, progress):
+        self.attempt_id = attempt_id
+        self.progress = progress
+
+    def freeze(self):
+        return self.progress
+
+
+def wait_for(scheduler, attempt_id, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        record = scheduler.poll(attempt_id)
+        if record is not None:
+            return record
+        time.sleep(0.01)
+    return None
+
+
+def test_expiry_freezes_the_current_attempt():
+    attempts = {"owner": FakeAttempt("a1", "before")}
+    scheduler = DeadlineScheduler(locate=attempts.get)
+    scheduler.schedule("a1", time.time() + 0.05, "owner")
+    # The owner's attempt is replaced (e.g. read back from a spill) before expiry
+    attempts["owner"] = FakeAttempt("a1", "latest")
+    record = wait_for(scheduler, "a1")
+    assert record["frozen"] == "latest"
+    assert scheduler.poll("a1") is None
+
+
+def test_gone_or_different_attempt_is_not_frozen():
+    attempts = {"other": FakeAttempt("a2", "someone else")}
+    scheduler = DeadlineScheduler(locate=attempts.get)
+    scheduler.schedule("a1", time.time() + 0.02, "gone")
+    scheduler.schedule("a3", time.time() + 0.02, "other")
+    assert wait_for(scheduler, "a1")["frozen"] is None
+    assert wait_for(scheduler, "a3")["frozen"] is None
+
+
+def test_earliest_deadline_fires_first():
+    scheduler = DeadlineScheduler()
+    now = time.time()
+    scheduler.schedule("late", now + 30, None)
+    scheduler.schedule("soon", now + 0.02, None)
+    assert wait_for(scheduler, "soon") is not None
+    assert scheduler.poll("late") is None
+    assert scheduler.stats()["scheduled"] == 1
+
+
+def test_cancelled_attempt_never_expires():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule("a1", time.time() + 0.02, None)
+    scheduler.cancel("a1")
+    assert wait_for(scheduler, "a1", timeout=0.2) is None
+
+
+def test_failing_expiry_does_not_stop_the_thread():
+    def locate(owner):
+        if owner == "bad":
+            raise RuntimeError("boom")
+        return None
+
+    scheduler = DeadlineScheduler(locate=locate)
+    scheduler.schedule("bad", time.time() + 0.02, "bad")
+    scheduler.schedule("good", time.time() + 0.05, "good")
+    assert wait_for(scheduler, "good") is not None
+    assert scheduler._thread.is_alive()
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from auth.passwords import verify_password
+from auth.store import UserStore
+from tools import import_cohort as ic
+
+COST = 1024
+ROSTER = "email,username,password\na@x.com,,\nB@x.com,,\nb@x.com,,\nc@x.com,,Strong123\n"
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    """Run the importer on a roster with invitations captured instead of sent."""
+    roster = tmp_path / "roster.csv"
+    roster.write_text(ROSTER)
+    db = tmp_path / "users.db"
+    sent = {}
+
+    def send(mail_queue, sender, pending):
+        sent.update({email: dict(invite) for email, invite in pending.items()})
+        return list(pending)
+
+    monkeypatch.setattr(ic, "send_invitations", send)
+    args = [str(roster), "--sender", "s@x.com", "--db", str(db), "--transport", "smtp",
+            "--cost", str(COST)]
+
+    def run_import():
+        return ic.main(args)
+
+    run_import.roster = roster
+    run_import.checkpoint = tmp_path / "roster.csv.checkpoint.json"
+    run_import.store = lambda: UserStore(str(db))
+    run_import.sent = sent
+    return run_import
+
+
+def test_imports_and_invites_with_working_passwords(run):
+    assert run() == 0
+    store = run.store()
+    assert store.count() == 3
+    assert set(run.sent) == {"a@x.com", "b@x.com", "c@x.com"}
+    for email in ("a@x.com", "b@x.com"):
+        assert verify_password(run.sent[email]["password"], store.get(email)["password"], COST)[0]
+    # Accounts with a roster password are not sent one
+    assert run.sent["c@x.com"]["password"] is None
+    assert not run.checkpoint.exists()
+
+
+def test_duplicate_emails_in_a_batch_are_rejected(run, capsys):
+    run()
+    assert "row 3: duplicate of row 2 (b@x.com)" in capsys.readouterr().out
+
+
+def test_crash_after_insert_keeps_invitations(run, monkeypatch):
+    add_many = UserStore.add_many
+
+    def crash(self, items):
+        add_many(self, items)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(UserStore, "add_many", crash)
+    with pytest.raises(KeyboardInterrupt):
+        run()
+    monkeypatch.setattr(UserStore, "add_many", add_many)
+
+    assert run() == 0
+    store = run.store()
+    for email in ("a@x.com", "b@x.com"):
+        assert verify_password(run.sent[email]["password"], store.get(email)["password"], COST)[0]
+
+
+def test_crash_before_insert_drops_staged_invitations(run, monkeypatch):
+    add_many = UserStore.add_many
+
+    def crash(self, items):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(UserStore, "add_many", crash)
+    with pytest.raises(KeyboardInterrupt):
+        run()
+    staged = json.loads(run.checkpoint.read_text())["pending"]
+    assert all("hash" in invite for invite in staged.values())
+    monkeypatch.setattr(UserStore, "add_many", add_many)
+
+    # The rerun creates the accounts with fresh passwords, which are the ones sent
+    assert run() == 0
+    store = run.store()
+    for email in ("a@x.com", "b@x.com"):
+        assert run.sent[email]["password"] != staged[email]["password"]
+        assert verify_password(run.sent[email]["password"], store.get(email)["password"], COST)[0]
+
+
+def test_confirm_staged_keeps_only_inserted_hashes(tmp_path):
+    store = UserStore(str(tmp_path / "users.db"))
+    store.add("a@x.com", {"password": "h1", "username": "a", "created_at": ""})
+    store.add("b@x.com", {"password": "other", "username": "b", "created_at": ""})
+    pending = {
+        "a@x.com": {"username": "a", "password": "p1", "hash": "h1"},
+        "b@x.com": {"username": "b", "password": "p2", "hash": "h2"},
+        "c@x.com": {"username": "c", "password": "p3", "hash": "h3"},
+        "d@x.com": {"username": "d", "password": "p4"},
+    }
+    assert ic.confirm_staged(store, pending, list(pending)) == 1
+    assert pending == {
+        "a@x.com": {"username": "a", "password": "p1"},
+        "d@x.com": {"username": "d", "password": "p4"},
+    }
+
+
+def test_edited_roster_keeps_unsent_invitations(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    pending = {"a@x.com": {"username": "a", "password": "Temp1234"}}
+    ic.save_checkpoint(str(path), {"roster": "old", "rows_done": 40, "pending": pending})
+    checkpoint = ic.load_checkpoint(str(path), "new")
+    assert checkpoint == {"roster": "new", "rows_done": 0, "pending": pending}
@@ -0,0 +1,84 @@
+import threading
+
+from auth.mailer import FAILED, SENT, MailQueue, build_message
+
+
+class FakeTransport:
+    """Stand-in transport that fails the first `failures` sends."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+        self.closed = 0
+        self._lock = threading.Lock()
+
+    def send(self, msg):
+        with self._lock:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("connection refused")
+            self.sent.append(msg["To"])
+
+    def close(self):
+        self.closed += 1
+
+
+def make_queue(transport, **kwargs):
+    kwargs.setdefault("backoff", 0.001)
+    return MailQueue(lambda: transport, workers=1, **kwargs)
+
+
+def message(to="student@example.com"):
+    return build_message("osce@example.com", to, "Subject", "Body")
+
+
+def test_sends_queued_messages():
+    transport = FakeTransport()
+    mail = make_queue(transport)
+    jobs = [mail.submit(message(f"s{i}@example.com")) for i in range(3)]
+    mail.join()
+    assert [mail.status(job) for job in jobs] == [SENT] * 3
+    assert transport.sent == ["s0@example.com", "s1@example.com", "s2@example.com"]
+    mail.shutdown()
+
+
+def test_retries_with_backoff_until_sent():
+    transport = FakeTransport(failures=2)
+    mail = make_queue(transport, max_attempts=3)
+    job = mail.submit(message())
+    mail.join()
+    assert mail.status(job) == SENT
+    assert transport.sent == ["student@example.com"]
+    # The connection is dropped after each failure
+    assert transport.closed >= 2
+    mail.shutdown()
+
+
+def test_fails_after_retry_limit():
+    transport = FakeTransport(failures=5)
+    mail = make_queue(transport, max_attempts=3)
+    job = mail.submit(message())
+    mail.join()
+    assert mail.status(job) == FAILED
+    assert transport.sent == []
+    assert transport.failures == 2
+    mail.shutdown()
+
+
+def test_full_queue_rejects_submission():
+    release = threading.Event()
+
+    class BlockingTransport(FakeTransport):
+        def send(self, msg):
+            release.wait()
+            super().send(msg)
+
+    mail = make_queue(BlockingTransport(), maxsize=1)
+    # At most one message is with the worker and one waits in the queue
+    jobs = [mail.submit(message()) for _ in range(3)]
+    assert jobs[0] is not None
+    assert jobs[-1] is None
+    release.set()
+    mail.join()
+    assert mail.status(jobs[0]) == SENT
+    mail.shutdown()
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from auth import ratelimit
+from auth.ratelimit import RateLimiter, client_ip
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+def test_allows_capacity_then_asks_to_wait(clock):
+    limiter = RateLimiter(capacity=3, per_seconds=60)
+    assert [limiter.hit([("ip", "1.2.3.4")]) for _ in range(3)] == [0, 0, 0]
+    assert limiter.hit([("ip", "1.2.3.4")]) == 20
+
+
+def test_refills_over_time(clock):
+    limiter = RateLimiter(capacity=2, per_seconds=60)
+    limiter.hit([("ip", "a")])
+    limiter.hit([("ip", "a")])
+    clock.now += 30
+    assert limiter.hit([("ip", "a")]) == 0
+    assert limiter.hit([("ip", "a")]) == 30
+
+
+def test_takes_nothing_unless_every_bucket_allows(clock):
+    limiter = RateLimiter(capacity=1, per_seconds=60)
+    limiter.hit([("email", "a@example.com")])
+    assert limiter.hit([("ip", "x"), ("email", "a@example.com")]) == 60
+    # The IP bucket was left untouched by the refused hit
+    assert limiter.hit([("ip", "x")]) == 0
+
+
+def test_empty_keys_are_ignored(clock):
+    limiter = RateLimiter(capacity=1, per_seconds=60)
+    assert limiter.hit([("ip", None), ("email", "")]) == 0
+    assert len(limiter) == 0
+
+
+def test_idle_buckets_are_pruned(clock):
+    limiter = RateLimiter(capacity=1, per_seconds=60)
+    limiter.hit([("ip", "a")])
+    clock.now += 61
+    limiter.hit([("ip", "b")])
+    assert len(limiter) == 1
+
+
+def fake_context(monkeypatch, hops, forwarded):
+    headers = {"X-Forwarded-For": forwarded} if forwarded else {}
+    context = SimpleNamespace(ip_address="10.0.0.1", headers=headers)
+    monkeypatch.setattr(ratelimit, "st", SimpleNamespace(context=context))
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXY_HOPS", hops)
+
+
+def test_client_ip_ignores_forwarded_header_without_trusted_proxy(monkeypatch):
+    fake_context(monkeypatch, 0, "6.6.6.6")
+    assert client_ip() == "10.0.0.1"
+
+
+def test_client_ip_takes_address_added_by_trusted_proxy(monkeypatch):
+    fake_context(monkeypatch, 1, "6.6.6.6, 203.0.113.7")
+    assert client_ip() == "203.0.113.7"
+    fake_context(monkeypatch, 2, "6.6.6.6, 203.0.113.7, 10.0.0.2")
+    assert client_ip() == "203.0.113.7"
+
+
+def test_client_ip_falls_back_when_header_is_short(monkeypatch):
+    fake_context(monkeypatch, 2, "203.0.113.7")
+    assert client_ip() == "10.0.0.1"
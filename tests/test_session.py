@@ -0,0 +1,66 @@
+import time
+
+from ui.session import Namespace, SessionRoot
+from ui.spill import SpillStore
+
+
+class FakeSessionState(dict):
+    @property
+    def filtered_state(self):
+        return dict(self)
+
+
+def make_root(tmp_path):
+    state = FakeSessionState()
+    root = SessionRoot("s1", state)
+    state["_namespaces"] = root
+    return root, state, SpillStore(str(tmp_path / "spill"))
+
+
+def test_spill_and_rehydrate(tmp_path):
+    root, state, store = make_root(tmp_path)
+    Namespace(root, "knee")["attempt"] = {"ticks": [1, 0]}
+    root.last_seen -= 3600
+    assert root.spill(store, idle_after=900)
+    assert root.spaces["knee"]["data"] is None
+    assert store.stats()["files"] == 1
+
+    root.enter(store)
+    assert Namespace(root, "knee")["attempt"] == {"ticks": [1, 0]}
+    assert store.stats()["files"] == 0
+
+
+def test_recently_active_session_is_not_spilled(tmp_path):
+    root, state, store = make_root(tmp_path)
+    Namespace(root, "knee")["attempt"] = 1
+    assert not root.spill(store, idle_after=900)
+
+
+def test_corrupt_spill_starts_afresh(tmp_path):
+    root, state, store = make_root(tmp_path)
+    ns = Namespace(root, "knee")
+    ns["attempt"] = 1
+    old_key = ns.key("notes")
+    root.last_seen -= 3600
+    root.spill(store, idle_after=900)
+    with open(store._path("s1"), "wb") as f:
+        f.write(b"\x80\x05truncated")
+    root.enter(store)
+    ns = Namespace(root, "knee")
+    assert "attempt" not in ns
+    assert ns.key("notes") != old_key
+    assert store.stats()["files"] == 0
+
+
+def test_drop_removes_data_and_widget_values(tmp_path):
+    root, state, store = make_root(tmp_path)
+    ns = Namespace(root, "knee")
+    ns["attempt"] = 1
+    state[ns.key("notes_0")] = "x" * 1000
+    state["knee:0:old_widget"] = "stale"
+    state["username"] = "student"
+    root.last_seen = time.time() - 86400
+    assert root.drop(store)
+    assert "attempt" not in Namespace(root, "knee")
+    assert set(state) == {"_namespaces", "username"}
+    assert not root.drop(store)
@@ -0,0 +1,43 @@
+import pytest
+
+from auth import tokens
+from auth.tokens import issue_token, verify_token
+
+SECRET = b"test-secret"
+
+
+def test_round_trip():
+    claims = verify_token(SECRET, issue_token(SECRET, "a@example.com", "a"))
+    assert claims["sub"] == "a@example.com"
+    assert claims["name"] == "a"
+    assert claims["jti"]
+
+
+def test_rejects_other_secret():
+    assert verify_token(b"other", issue_token(SECRET, "a@example.com", "a")) is None
+
+
+def test_rejects_tampered_payload():
+    token = issue_token(SECRET, "a@example.com", "a")
+    other = issue_token(SECRET, "admin@example.com", "admin")
+    assert verify_token(SECRET, f"{other.split('.')[0]}.{token.split('.')[1]}") is None
+
+
+def test_rejects_expired(monkeypatch):
+    token = issue_token(SECRET, "a@example.com", "a", ttl=60)
+    now = tokens.time.time()
+    monkeypatch.setattr(tokens.time, "time", lambda: now + 61)
+    assert verify_token(SECRET, token) is None
+
+
+@pytest.mark.parametrize("token", [
+    None, "", "no-dot", "a.b.c", "é.sig", "payload.é", "\udcff.x",
+    "bm90LWpzb24.x",
+])
+def test_malformed_tokens_are_invalid(token):
+    assert verify_token(SECRET, token) is None
+
+
+def test_signed_non_object_payload_is_invalid():
+    payload = tokens._b64encode(b"[1, 2]")
+    assert verify_token(SECRET, f"{payload}.{tokens._sign(SECRET, payload)}") is None
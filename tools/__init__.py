@@ -0,0 +1,2 @@
+# Makes the tools module a package
+# Command-line helpers for administrators, run with python -m tools.<name>
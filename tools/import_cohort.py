@@ -0,0 +1,292 @@
+"""Create accounts for a whole cohort from a CSV roster and email invitations.
+
+Usage:
+    python -m tools.import_cohort roster.csv --sender osce@example.com
+
+The roster needs an ``email`` column and may have ``username`` and
+``password`` columns. Rows without a password get a random temporary one,
+which is included in the invitation. Accounts are written in batched
+transactions and invitations are sent concurrently through SendGrid
+(SENDGRID_API_KEY) or, with --transport smtp, any SMTP server such as a
+local stand-in.
+
+Progress is kept in a checkpoint file next to the roster. If the import is
+interrupted, run the same command again: finished rows are skipped and
+unsent invitations are retried. Invitations are staged in the checkpoint
+before their accounts are inserted, and a rerun keeps only those whose
+accounts were actually written. The checkpoint holds temporary passwords
+until their invitations go out, so it is written with owner-only
+permissions and deleted once everything has been sent.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import secrets
+import string
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from auth.mailer import SENT, MailQueue, SendGridTransport, SMTPTransport, build_message
+from auth.passwords import DEFAULT_COST, hash_password, is_password_strong
+from auth.store import USER_DB_FILE, UserStore
+
+INVITATION_SUBJECT = "Your OSCE Practice App account"
+INVITATION_BODY = """
+Hi {username} 👋,
+
+An OSCE Practice App account has been created for you.
+
+Email: {email}
+{password_line}
+
+Cheers,
+The OSCE Team 🩺
+"""
+
+
+def generate_password(length=12):
+    """Random temporary password that passes is_password_strong."""
+    alphabet = string.ascii_letters + string.digits
+    while True:
+        password = "".join(secrets.choice(alphabet) for _ in range(length))
+        if is_password_strong(password):
+            return password
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_checkpoint(path, roster_digest):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("roster") == roster_digest:
+            return checkpoint
+        # The roster was edited. Its rows are read again from the top, but
+        # unsent invitations hold the only copy of temporary passwords for
+        # accounts that already exist, so they are kept
+        pending = checkpoint.get("pending", {})
+        print(f"Checkpoint {path} belongs to a different roster, starting over "
+              f"but keeping {len(pending)} unsent invitations.")
+        return {"roster": roster_digest, "rows_done": 0, "pending": pending}
+    return {"roster": roster_digest, "rows_done": 0, "pending": {}}
+
+
+def save_checkpoint(path, checkpoint):
+    # Write to a temp file and swap it in so a crash never leaves half a checkpoint
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def read_batches(roster_path, skip, batch_size):
+    """Stream (row_number, row) batches from the roster, skipping rows already done."""
+    with open(roster_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        batch = []
+        for row_number, row in enumerate(reader, start=1):
+            if row_number <= skip:
+                continue
+            batch.append((row_number, row))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def validate_row(row):
+    """Return (email, username, password, generated) or raise ValueError."""
+    email = (row.get("email") or "").strip().lower()
+    if "@" not in email:
+        raise ValueError(f"invalid email '{email}'")
+    username = (row.get("username") or "").strip() or email.split("@")[0]
+    password = (row.get("password") or "").strip()
+    if password:
+        if not is_password_strong(password):
+            raise ValueError("password must be at least 8 characters with uppercase, lowercase and a number")
+        return email, username, password, False
+    return email, username, generate_password(), True
+
+
+def confirm_staged(store, pending, emails):
+    """Settle invitations staged before their accounts were inserted.
+
+    An invitation is kept only if the stored hash is the one staged with it,
+    i.e. our insert went through; otherwise its temporary password would not
+    work and the entry is dropped. Returns how many were confirmed.
+    """
+    confirmed = 0
+    for email in emails:
+        invite = pending.get(email)
+        if invite is None or "hash" not in invite:
+            continue
+        record = store.get(email)
+        if record is not None and record["password"] == invite.pop("hash"):
+            confirmed += 1
+        else:
+            del pending[email]
+    return confirmed
+
+
+def build_invitation(sender, email, username, password):
+    if password:
+        password_line = f"Temporary password: {password}\nPlease change it after your first login."
+    else:
+        password_line = "Sign in with the password you gave your course coordinator."
+    body = INVITATION_BODY.format(username=username, email=email, password_line=password_line)
+    return build_message(sender, email, INVITATION_SUBJECT, body)
+
+
+def send_invitations(mail_queue, sender, pending):
+    """Send every pending invitation; returns the emails that went out."""
+    jobs = {}
+    for email, invite in pending.items():
+        msg = build_invitation(sender, email, invite["username"], invite["password"])
+        job_id = mail_queue.submit(msg)
+        if job_id is not None:
+            jobs[email] = job_id
+    mail_queue.join()
+    return [email for email, job_id in jobs.items() if mail_queue.status(job_id) == SENT]
+
+
+def make_transport_factory(args):
+    if args.transport == "smtp":
+        return lambda: SMTPTransport(
+            args.smtp_host, args.smtp_port,
+            os.environ.get("SMTP_USER"), os.environ.get("SMTP_PASS"),
+            use_ssl=args.smtp_ssl,
+        )
+    api_key = os.environ.get("SENDGRID_API_KEY")
+    if not api_key:
+        sys.exit("SENDGRID_API_KEY is not set (or use --transport smtp)")
+    return lambda: SendGridTransport(api_key)
+
+
+def import_cohort(args):
+    roster_digest = file_digest(args.roster)
+    checkpoint_path = args.checkpoint or f"{args.roster}.checkpoint.json"
+    checkpoint = load_checkpoint(checkpoint_path, roster_digest)
+    store = UserStore(args.db)
+    mail_queue = MailQueue(
+        make_transport_factory(args), workers=args.workers,
+        maxsize=max(args.batch_size, 1) * 2,
+    )
+    hashers = ThreadPoolExecutor(max_workers=args.workers)
+
+    created = skipped = invited = 0
+    rejected = []
+    started = time.perf_counter()
+
+    # A run interrupted mid-insert leaves staged invitations; keep the ones
+    # whose accounts made it into the database
+    staged = [email for email, invite in checkpoint["pending"].items() if "hash" in invite]
+    if staged:
+        created += confirm_staged(store, checkpoint["pending"], staged)
+        save_checkpoint(checkpoint_path, checkpoint)
+
+    # Invitations left over from an interrupted run go first
+    if checkpoint["pending"]:
+        print(f"Retrying {len(checkpoint['pending'])} unsent invitations from the last run")
+        for email in send_invitations(mail_queue, args.sender, checkpoint["pending"]):
+            del checkpoint["pending"][email]
+            invited += 1
+        save_checkpoint(checkpoint_path, checkpoint)
+
+    for batch in read_batches(args.roster, checkpoint["rows_done"], args.batch_size):
+        rows = []
+        seen = {}
+        for row_number, row in batch:
+            try:
+                email, username, password, generated = validate_row(row)
+            except ValueError as e:
+                rejected.append((row_number, str(e)))
+                continue
+            if email in seen:
+                rejected.append((row_number, f"duplicate of row {seen[email]} ({email})"))
+                continue
+            seen[email] = row_number
+            rows.append((email, username, password, generated))
+
+        existing = store.existing(email for email, _, _, _ in rows)
+        new_rows = [r for r in rows if r[0] not in existing]
+        skipped += len(rows) - len(new_rows)
+
+        hashes = list(hashers.map(lambda r: hash_password(r[2], args.cost), new_rows))
+        created_at = time.strftime("%Y-%m-%d")
+        accounts = [
+            (email, {"password": password_hash, "username": username, "created_at": created_at})
+            for (email, username, _, _), password_hash in zip(new_rows, hashes)
+        ]
+
+        # Stage the invitations, with the hash being inserted, before the
+        # accounts are written, so a crash at any point either finds them on
+        # the next run or finds the accounts were never created
+        for (email, username, password, generated), password_hash in zip(new_rows, hashes):
+            checkpoint["pending"][email] = {
+                "username": username,
+                "password": password if generated else None,
+                "hash": password_hash,
+            }
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        store.add_many(accounts)
+        new_emails = [email for email, _, _, _ in new_rows]
+        created += confirm_staged(store, checkpoint["pending"], new_emails)
+        checkpoint["rows_done"] = batch[-1][0]
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        batch_pending = {email: checkpoint["pending"][email] for email in new_emails
+                         if email in checkpoint["pending"]}
+        for email in send_invitations(mail_queue, args.sender, batch_pending):
+            del checkpoint["pending"][email]
+            invited += 1
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        print(f"Row {checkpoint['rows_done']}: {created} created, {skipped} already registered, "
+              f"{invited} invited, {len(rejected)} rejected")
+
+    hashers.shutdown()
+    mail_queue.shutdown()
+
+    elapsed = time.perf_counter() - started
+    print(f"Done in {elapsed:.1f}s: {created} created, {skipped} already registered, "
+          f"{invited} invited, {len(rejected)} rejected")
+    for row_number, reason in rejected:
+        print(f"  row {row_number}: {reason}")
+
+    if checkpoint["pending"]:
+        print(f"{len(checkpoint['pending'])} invitations failed; run the same command again to retry.")
+        return 1
+    os.remove(checkpoint_path)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-create OSCE accounts from a CSV roster.")
+    parser.add_argument("roster", help="CSV file with an email column and optional username/password")
+    parser.add_argument("--sender", required=True, help="From address for invitations")
+    parser.add_argument("--db", default=USER_DB_FILE, help="User database (default: %(default)s)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <roster>.checkpoint.json)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Rows per transaction")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent hashing and sending threads")
+    parser.add_argument("--cost", type=int, default=DEFAULT_COST, help="scrypt cost for new passwords")
+    parser.add_argument("--transport", choices=["sendgrid", "smtp"], default="sendgrid")
+    parser.add_argument("--smtp-host", default="localhost")
+    parser.add_argument("--smtp-port", type=int, default=1025)
+    parser.add_argument("--smtp-ssl", action="store_true", help="Use SMTP over SSL")
+    return import_cohort(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
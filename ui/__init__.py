@@ -0,0 +1,2 @@
+# Makes the ui module a package
+# Shared page helpers used by every page: styles, payload metering and session state
@@ -0,0 +1,81 @@
+import os
+import threading
+from collections import deque
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Show each session the size of its last rerun in the sidebar
+SHOW_METER = os.environ.get("OSCE_PAYLOAD_METER", "0") == "1"
+PAYLOAD_SAMPLES = 200
+
+_METER_KEY = "_payload_meter"
+
+# Bytes sent per rerun, per page, process-wide
+_lock = threading.Lock()
+_pages = {}
+
+
+class _Meter:
+    """Counts the bytes a session sends to the browser, one rerun at a time.
+
+    Streamlit gives every rerun a new script context, so the meter lives in
+    session state and is attached to each rerun's message queue in turn.
+    """
+
+    def __init__(self):
+        self.send = None
+        self.page = None
+        self.bytes = 0
+
+    def attach(self, ctx):
+        if ctx._enqueue is not self:
+            self.send = ctx._enqueue
+            ctx._enqueue = self
+
+    def __call__(self, msg):
+        self.bytes += msg.ByteSize()
+        self.send(msg)
+
+    def start(self, page):
+        """Close the previous rerun's count and start one for this rerun."""
+        if self.page is not None:
+            with _lock:
+                _pages.setdefault(self.page, deque(maxlen=PAYLOAD_SAMPLES)).append(self.bytes)
+        last = self.bytes
+        self.page = page
+        self.bytes = 0
+        return last
+
+
+def meter_payload(page):
+    """Count the bytes this rerun sends to the browser, under the page's name.
+
+    Call at the top of a page. Fragment reruns are added to the rerun before
+    them. Does nothing outside a Streamlit session.
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None or not hasattr(ctx, "_enqueue"):
+        return
+    meter = st.session_state.get(_METER_KEY)
+    if meter is None:
+        meter = st.session_state[_METER_KEY] = _Meter()
+    last = meter.start(page)
+    meter.attach(ctx)
+    if SHOW_METER and last:
+        st.sidebar.caption(f"📦 Last rerun sent {last / 1024:.1f} KB")
+
+
+def payload_stats():
+    """Bytes sent per rerun for each page."""
+    with _lock:
+        samples = {page: list(sizes) for page, sizes in _pages.items()}
+    return {
+        page: {
+            "runs": len(sizes),
+            "mean_bytes": sum(sizes) / len(sizes),
+            "last_bytes": sizes[-1],
+            "max_bytes": max(sizes),
+        }
+        for page, sizes in samples.items()
+    }
@@ -0,0 +1,302 @@
+import os
+import pickle
+import sys
+import threading
+import time
+import weakref
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from ui.spill import get_spill_store
+
+_ROOT_KEY = "_namespaces"
+
+# Sessions idle this long have their namespaces spilled to disk; after
+# ABANDON_SECONDS their station data is dropped altogether
+IDLE_SECONDS = int(os.environ.get("OSCE_IDLE_SPILL_SECONDS", 15 * 60))
+ABANDON_SECONDS = int(os.environ.get("OSCE_ABANDON_SECONDS", 24 * 60 * 60))
+SWEEP_INTERVAL = 60
+
+# Live sessions by id. Each root lives in its session's state, so entries
+# disappear when Streamlit drops the session.
+_registry_lock = threading.Lock()
+_registry = weakref.WeakValueDictionary()
+_sweep_stats = {"spilled": 0, "rehydrated": 0, "dropped": 0}
+
+
+def approx_size(value):
+    """Approximate bytes held by a value (its pickled size where possible)."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class SessionRoot:
+    """Per-session holder of every namespace, kept in st.session_state."""
+
+    def __init__(self, session_id, session_state):
+        self.session_id = session_id
+        self.spaces = {}  # name -> {"gen": int, "data": dict, or None while spilled}
+        self.user = None
+        self.last_seen = time.time()
+        self.spilled = False
+        self._lock = threading.Lock()
+        self._session_state = weakref.ref(session_state) if session_state is not None else None
+
+    def touch(self):
+        self.last_seen = time.time()
+        self.user = st.session_state.get("username", self.user)
+
+    def enter(self, store):
+        """Mark the session active, first reading back anything spilled while it was idle."""
+        with self._lock:
+            self.last_seen = time.time()
+            if not self.spilled:
+                return
+            spaces = store.load(self.session_id) or {}
+            for name, space in self.spaces.items():
+                if name in spaces:
+                    space["data"] = spaces[name]
+                else:  # Spill was purged: start the namespace afresh
+                    space["data"] = {}
+                    space["gen"] += 1
+            self.spilled = False
+        _sweep_stats["rehydrated"] += 1
+
+    def spill(self, store, idle_after):
+        """Move namespace data to the spill store if the session is still idle."""
+        with self._lock:
+            if self.spilled or time.time() - self.last_seen < idle_after:
+                return False
+            spaces = {name: space["data"] for name, space in self.spaces.items() if space["data"]}
+            if not spaces:
+                return False
+            try:
+                store.save(self.session_id, spaces)
+            except (pickle.PicklingError, TypeError, AttributeError, OSError):
+                return False  # Keep it resident rather than lose it
+            for space in self.spaces.values():
+                space["data"] = None
+            self.spilled = True
+        _sweep_stats["spilled"] += 1
+        return True
+
+    def drop(self, store):
+        """Forget an abandoned session's station data, resident or spilled.
+
+        Its namespaced widget values (notes, answers, ticks) are deleted too:
+        an abandoned session never reruns, so Streamlit would never clean
+        them up itself.
+        """
+        with self._lock:
+            session_state = self._session_state() if self._session_state else None
+            widget_keys = self._namespaced_keys(session_state)
+            if not (self.spilled or widget_keys or any(space["data"] for space in self.spaces.values())):
+                return False
+            store.discard(self.session_id)
+            for space in self.spaces.values():
+                space["data"] = {}
+                space["gen"] += 1
+            for key in widget_keys:
+                try:
+                    del session_state[key]
+                except KeyError:
+                    pass
+            self.spilled = False
+        _sweep_stats["dropped"] += 1
+        return True
+
+    def _namespaced_keys(self, session_state):
+        """Session state keys made by Namespace.key(), from any generation."""
+        if session_state is None or not self.spaces:
+            return []
+        prefixes = tuple(f"{name}:" for name in self.spaces)
+        return [key for key in session_state.filtered_state if key.startswith(prefixes)]
+
+    def _other_state(self):
+        session_state = self._session_state() if self._session_state else None
+        return session_state.filtered_state if session_state is not None else {}
+
+    def sizes(self):
+        """Approximate bytes per namespace, plus "(app)" for keys outside any namespace."""
+        sizes = {name: approx_size(space["data"] or {}) for name, space in self.spaces.items()}
+        sizes["(app)"] = 0
+        for key, value in self._other_state().items():
+            if key == _ROOT_KEY:
+                continue
+            name = key.split(":", 1)[0] if ":" in key else None
+            bucket = name if name in sizes else "(app)"
+            sizes[bucket] += len(key) + approx_size(value)
+        return sizes
+
+
+class Namespace:
+    """One station's (or page's) slice of session state.
+
+    Values are stored with ns["name"] and widgets use ns.key("name") as
+    their key. clear() drops both in O(1): the values dict is replaced and the
+    widget key generation moves on, so old widget values are never read again
+    and Streamlit discards them on the next rerun.
+    """
+
+    def __init__(self, root, name):
+        self.name = name
+        self._space = root.spaces.setdefault(name, {"gen": 0, "data": {}})
+
+    @property
+    def data(self):
+        return self._space["data"]
+
+    def key(self, name):
+        return f"{self.name}:{self._space['gen']}:{name}"
+
+    def get(self, name, default=None):
+        return self.data.get(name, default)
+
+    def setdefault(self, name, default):
+        return self.data.setdefault(name, default)
+
+    def pop(self, name, default=None):
+        return self.data.pop(name, default)
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    def __setitem__(self, name, value):
+        self.data[name] = value
+
+    def __contains__(self, name):
+        return name in self.data
+
+    def widget_value(self, name, default=None):
+        """Current value of a widget keyed with key(name)."""
+        return st.session_state.get(self.key(name), default)
+
+    def clear(self):
+        self._space["data"] = {}
+        self._space["gen"] += 1
+
+
+def session_root():
+    """This session's namespace root, created and registered on first use."""
+    root = st.session_state.get(_ROOT_KEY)
+    if root is None:
+        ctx = get_script_run_ctx()
+        session_id = ctx.session_id if ctx is not None else "local"
+        root = SessionRoot(session_id, ctx.session_state if ctx is not None else None)
+        st.session_state[_ROOT_KEY] = root
+        with _registry_lock:
+            _registry[session_id] = root
+    root.enter(get_spill_store())
+    return root
+
+
+def namespace(name):
+    """Session state namespace for a station or page."""
+    return Namespace(session_root(), name)
+
+
+def track_session():
+    """Note that this session is active. Call at the top of every page."""
+    get_session_sweeper()
+    session_root().touch()
+
+
+def peek(session_id, name, key):
+    """Value under key in another session's namespace, for background threads.
+
+    Returns None if that session is gone, spilled to disk, or has no such value.
+    """
+    with _registry_lock:
+        root = _registry.get(session_id)
+    if root is None:
+        return None
+    with root._lock:
+        space = root.spaces.get(name)
+        data = space["data"] if space is not None else None
+        return data.get(key) if data else None
+
+
+def clear_session():
+    """Drop every namespace and every other key, e.g. on logout."""
+    root = st.session_state.get(_ROOT_KEY)
+    if root is not None:
+        for name in list(root.spaces):
+            Namespace(root, name).clear()
+        root.user = None
+    for key in list(st.session_state.keys()):
+        if key != _ROOT_KEY:
+            del st.session_state[key]
+
+
+def session_sizes():
+    """Size breakdown for every live session, largest first."""
+    with _registry_lock:
+        roots = list(_registry.values())
+    sessions = []
+    for root in roots:
+        sizes = root.sizes()
+        sessions.append({
+            "session_id": root.session_id,
+            "user": root.user,
+            "last_seen": root.last_seen,
+            "total_bytes": sum(sizes.values()),
+            "spilled": root.spilled,
+            "namespaces": sizes,
+        })
+    sessions.sort(key=lambda s: s["total_bytes"], reverse=True)
+    return sessions
+
+
+class SessionSweeper:
+    """Background thread that bounds resident session state by active users.
+
+    Every interval it spills the namespaces of sessions idle past idle_after
+    to the spill store, and drops station data from sessions idle past
+    abandon_after (plus any spill files that old). A spilled session is read
+    back transparently the next time it touches its state.
+    """
+
+    def __init__(self, store, idle_after=IDLE_SECONDS, abandon_after=ABANDON_SECONDS,
+                 interval=SWEEP_INTERVAL):
+        self.store = store
+        self.idle_after = idle_after
+        self.abandon_after = abandon_after
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._work, name="session-sweeper", daemon=True)
+        self._thread.start()
+
+    def sweep(self):
+        with _registry_lock:
+            roots = list(_registry.values())
+        now = time.time()
+        for root in roots:
+            if now - root.last_seen >= self.abandon_after:
+                root.drop(self.store)
+            elif now - root.last_seen >= self.idle_after:
+                root.spill(self.store, self.idle_after)
+        self.store.purge(self.abandon_after)
+
+    def shutdown(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _work(self):
+        while not self._stopped.wait(self.interval):
+            self.sweep()
+
+
+@st.cache_resource
+def get_session_sweeper():
+    """Return the process-wide idle-session sweeper, started on first use."""
+    return SessionSweeper(get_spill_store())
+
+
+def sweeper_stats():
+    """Sessions spilled, read back and dropped since startup, plus the spill store's size."""
+    with _registry_lock:
+        resident = sum(1 for root in _registry.values() if not root.spilled)
+    return dict(_sweep_stats, resident_sessions=resident, **get_spill_store().stats())
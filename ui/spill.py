@@ -0,0 +1,77 @@
+import logging
+import os
+import pickle
+import tempfile
+import time
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+SPILL_DIR = os.environ.get("OSCE_SPILL_DIR", "session_spill")
+
+
+class SpillStore:
+    """Idle sessions' namespace data, pickled to one owner-only file per session."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, session_id):
+        return os.path.join(self.directory, f"{session_id}.pkl")
+
+    def save(self, session_id, spaces):
+        """Write {namespace: data} for a session, replacing any earlier spill."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(spaces, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(session_id))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, session_id):
+        """Read a session's spilled data and remove the file.
+
+        Returns None if the file is missing or can't be read back (e.g.
+        truncated by a crash); the session then starts afresh.
+        """
+        path = self._path(session_id)
+        try:
+            with open(path, "rb") as f:
+                spaces = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Discarding unreadable session spill %s", path, exc_info=True)
+            spaces = None
+        self.discard(session_id)
+        return spaces
+
+    def discard(self, session_id):
+        try:
+            os.unlink(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def purge(self, max_age):
+        """Delete spills older than max_age seconds, e.g. from sessions that never came back."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        return removed
+
+    def stats(self):
+        files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".pkl")]
+        return {"files": len(files), "bytes": sum(entry.stat().st_size for entry in files)}
+
+
+@st.cache_resource
+def get_spill_store():
+    """Return the process-wide spill store in OSCE_SPILL_DIR."""
+    return SpillStore(SPILL_DIR)
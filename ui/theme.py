@@ -0,0 +1,63 @@
+import hashlib
+import json
+
+import streamlit as st
+
+# Class-based styles shared by every page. Pages emit small class-tagged
+# markup; the rules themselves reach the browser once per session.
+STYLESHEET = """
+.osce-app-title { text-align: center; color: #19527c; }
+.osce-footer { text-align: center; color: #666; }
+.osce-footer-version { color: #888; margin-top: 50px; }
+
+.osce-welcome-popup {
+    position: fixed;
+    top: 25%;
+    left: 50%;
+    transform: translate(-50%, -50%);
+    background-color: #ffffff;
+    padding: 2em 3em;
+    border-radius: 12px;
+    box-shadow: 0 0 20px rgba(0,0,0,0.2);
+    animation: osce-fade-in 1s ease-in-out forwards;
+    z-index: 9999;
+}
+.osce-welcome-popup h3 { color: #19527c; }
+.osce-welcome-popup p { font-size: 16px; }
+@keyframes osce-fade-in {
+    from {opacity: 0; transform: translate(-50%, -60%);}
+    to {opacity: 1; transform: translate(-50%, -50%);}
+}
+
+.st-key-osce-float-right .stButton button { float: right; }
+
+.osce-timer-box { background-color: #f0f0f0; padding: 10px; border-radius: 5px; text-align: center; }
+.osce-timer-box.osce-stopwatch { background-color: #f5f5f5; border: 2px solid #4CAF50; }
+.osce-checklist-header { background-color: #f9f9f9; padding: 15px; border-radius: 10px; border: 1px solid #ddd; }
+.osce-summary-card { background-color: #f0f7ff; padding: 20px; border-radius: 10px; border: 2px solid #4285f4; margin-bottom: 20px; }
+.osce-section-score { background-color: #f9f9f9; padding: 10px; border-radius: 5px; margin-bottom: 10px; border-left: 5px solid #4CAF50; }
+.osce-case-box { background-color: #e6f7ff; padding: 20px; border: 2px solid #91d5ff; border-radius: 10px; margin-bottom: 15px; }
+.osce-case-highlight { background-color: #ffff00; padding: 2px 5px; font-weight: bold; }
+"""
+
+STYLESHEET_VERSION = hashlib.sha256(STYLESHEET.encode("utf-8")).hexdigest()[:12]
+_SENT_KEY = "_theme_sent"
+
+
+def apply_theme():
+    """Send the shared stylesheet to the browser once per session.
+
+    The rules go into the page <head>, where they outlive reruns and page
+    switches, so later reruns send nothing.
+    """
+    if st.session_state.get(_SENT_KEY) == STYLESHEET_VERSION:
+        return
+    st.html(
+        "<script>"
+        "let style = document.getElementById('osce-theme');"
+        "if (!style) { style = document.createElement('style'); style.id = 'osce-theme'; document.head.append(style); }"
+        f"style.textContent = {json.dumps(STYLESHEET)};"
+        "</script>",
+        unsafe_allow_javascript=True,
+    )
+    st.session_state[_SENT_KEY] = STYLESHEET_VERSION